@@ -0,0 +1,61 @@
+"""
+Dashboard cost with many nodes: widget cards (DashboardCard grid) vs. the virtualized tile view.
+Times opening the window and one status batch touching every node, on the offscreen Qt platform.
+
+    python benchmarks/dashboard_open.py [node_count ...]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication
+from src.core.models import NodeModel, NodeStatus
+from src.core.node_manager import NodeManager
+from src.ui.dashboard_window import DashboardWindow
+
+def build_manager(path, node_count):
+    manager = NodeManager(path, snapshot=False)
+    with manager.bulk_edit():
+        for i in range(node_count):
+            device = NodeModel(f"device-{i}")
+            device.ip_address = f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}"
+            manager.add_node(device)
+    return manager
+
+def measure(app, manager, tile_mode):
+    started = time.perf_counter()
+    window = DashboardWindow(manager, tile_mode=tile_mode)
+    window.show()
+    app.processEvents()
+    opened = time.perf_counter() - started
+
+    devices = manager.dashboard_nodes()
+    for node in devices:
+        manager.set_status(node, NodeStatus.NORMAL, ping_ms=1.0)
+    started = time.perf_counter()
+    window.update_cards({node.id for node in devices})
+    app.processEvents()
+    updated = time.perf_counter() - started
+    window.close()
+    window.deleteLater()
+    app.processEvents()
+    return opened, updated
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [200, 1000, 5000]
+    app = QApplication([])
+    with tempfile.TemporaryDirectory() as tmp:
+        for node_count in sizes:
+            manager = build_manager(os.path.join(tmp, f"tree_{node_count}.json"), node_count)
+            card_open, card_update = measure(app, manager, tile_mode=False)
+            tile_open, tile_update = measure(app, manager, tile_mode=True)
+            print(f"{node_count:>6} nodes  cards: open {card_open:7.3f}s update {card_update:7.3f}s  "
+                  f"tiles: open {tile_open:7.3f}s update {tile_update:7.3f}s")
+    os._exit(0)  # atexit flush 생략
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Memory per NodeModel, measured with tracemalloc.
+
+Builds node_count device nodes from JSON through from_dict() (the load path) and reports the bytes allocated per
+node, with an empty history and after `results` probe results per node.
+
+    python benchmarks/node_memory.py [node_count] [results]
+"""
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+import uuid
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.models import NodeModel, NodeStatus
+
+def main():
+    node_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    results = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    template = NodeModel("template")
+    texts = []
+    for i in range(node_count):
+        template.id = str(uuid.uuid4())
+        template.name = f"device-{i}"
+        template.ip_address = f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}"
+        texts.append(json.dumps(template.to_dict()))
+    del template
+
+    gc.collect()
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    nodes = [NodeModel.from_dict(json.loads(text)) for text in texts]
+    gc.collect()
+    empty, _ = tracemalloc.get_traced_memory()
+
+    now = time.time()
+    for node in nodes:
+        for k in range(results):
+            node.history.append(now + k, NodeStatus.NORMAL, 1.5, NodeStatus.UNKNOWN, 0.0)
+    filled, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{node_count} nodes: {(empty - base) / node_count:7.0f} bytes/node (empty history), "
+          f"{(filled - base) / node_count:7.0f} bytes/node (after {results} results)")
+
+if __name__ == "__main__":
+    main()
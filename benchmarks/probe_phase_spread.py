@@ -0,0 +1,58 @@
+"""
+Probe-rate flatness: lockstep start vs. phase-spread scheduling.
+
+Simulates the due times the scheduler would produce for a synthetic tree
+(no network access) and prints the per-second probe count mean/variance.
+
+    python benchmarks/probe_phase_spread.py [node_count] [seconds]
+"""
+import os
+import random
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.models import NodeModel
+from src.core.probe_scheduler import ProbeScheduler
+
+INTERVALS = [5, 10, 30, 60]
+
+def simulate(nodes, seconds, next_due):
+    counts = [0] * seconds
+    for node in nodes:
+        due = next_due(node, None)
+        while due < seconds:
+            counts[int(due)] += 1
+            due = next_due(node, due)
+    mean = sum(counts) / seconds
+    variance = sum((c - mean) ** 2 for c in counts) / seconds
+    return mean, variance, max(counts)
+
+def main():
+    node_count = int(sys.argv[1]) if len(sys.argv) > 1 else 8000
+    seconds = int(sys.argv[2]) if len(sys.argv) > 2 else 600
+
+    random.seed(1)
+    nodes = []
+    for i in range(node_count):
+        node = NodeModel(f"node-{i}")
+        node.ip_address = f"10.{i // 65536}.{(i // 256) % 256}.{i % 256}"
+        node.check_interval_seconds = random.choice(INTERVALS)
+        nodes.append(node)
+
+    scheduler = ProbeScheduler(on_result=lambda *args: None)
+    scheduler._epoch = 0.0
+
+    def lockstep(node, previous):
+        # 기존 방식: 모든 노드가 동시에 시작, interval 마다 반복
+        return 0.0 if previous is None else previous + node.check_interval_seconds
+
+    def spread(node, previous):
+        return scheduler._next_slot(node, -1e-9 if previous is None else previous)
+
+    for label, next_due in (("lockstep", lockstep), ("phase-spread", spread)):
+        mean, variance, peak = simulate(nodes, seconds, next_due)
+        print(f"{label:>13}: mean {mean:8.1f} probes/s  variance {variance:12.1f}  peak {peak}")
+
+if __name__ == "__main__":
+    main()
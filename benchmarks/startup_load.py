@@ -0,0 +1,101 @@
+"""
+Tree load time at startup: JSON only vs. binary snapshot cache.
+
+Builds synthetic trees (groups of 10 folders with 99 devices each), saves them
+with NodeManager and times NodeManager() construction:
+  before - the loader before the snapshot change, re-enacted here: json.load and a
+           recursive from_dict that generated two uuid4() per node, with GC running
+  json   - snapshot disabled, JSON parsed every time
+  cold   - snapshot enabled but missing/stale (JSON parsed, cache rebuilt)
+  warm   - snapshot valid (JSON only checksummed)
+Each load runs in a fresh interpreter, like a real startup.
+
+    python benchmarks/startup_load.py [node_count ...]
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.models import NodeModel
+from src.core.node_manager import NodeManager
+
+def build_tree(manager, node_count):
+    created = 0
+    with manager.bulk_edit():
+        while created < node_count:
+            group = NodeModel(f"group-{created}")
+            manager.add_node(group)
+            created += 1
+            for _ in range(10):
+                if created >= node_count:
+                    break
+                folder = NodeModel(f"folder-{created}")
+                manager.add_node(folder, group.id)
+                created += 1
+                for _ in range(min(99, node_count - created)):
+                    device = NodeModel(f"device-{created}")
+                    device.ip_address = f"10.{created >> 16 & 255}.{created >> 8 & 255}.{created & 255}"
+                    manager.add_node(device, folder.id)
+                    created += 1
+
+def baseline_load(path):
+    """Previous NodeManager.load_data(): json.load, then recursive from_dict + registration."""
+    all_nodes = {}
+
+    def from_dict(data, parent_id=None):
+        str(uuid.uuid4())  # 이전 NodeModel.__init__ 의 id
+        node = NodeModel.from_dict(data, parent_id, recursive=False)
+        node.id = data.get("id", str(uuid.uuid4()))  # 이전 from_dict: 기본값을 항상 생성
+        for child_data in data.get("children", []):
+            node.children.append(from_dict(child_data, node.id))
+        return node
+
+    def register(node):
+        all_nodes[node.id] = node
+        for child in node.children:
+            register(child)
+
+    with open(path, "r", encoding="utf-8") as f:
+        for item_data in json.load(f):
+            register(from_dict(item_data))
+    return all_nodes
+
+def timed_load(path, snapshot):
+    """snapshot: True/False for NodeManager, None for the previous loader (baseline_load)."""
+    mode = "baseline" if snapshot is None else str(int(snapshot))
+    output = subprocess.check_output([sys.executable, os.path.abspath(__file__), "--load", path, mode])
+    elapsed, loaded = output.split()
+    return float(elapsed), int(loaded)
+
+def main():
+    if sys.argv[1:2] == ["--load"]:
+        started = time.perf_counter()
+        if sys.argv[3] == "baseline":
+            loaded = len(baseline_load(sys.argv[2]))
+        else:
+            loaded = len(NodeManager(sys.argv[2], snapshot=bool(int(sys.argv[3])))._all_nodes)
+        print(time.perf_counter() - started, loaded)
+        os._exit(0)  # atexit flush 생략 (변경 없음)
+
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000]
+    with tempfile.TemporaryDirectory() as tmp:
+        for node_count in sizes:
+            path = os.path.join(tmp, f"tree_{node_count}.json")
+            build_tree(NodeManager(path), node_count)
+
+            before_time, _ = timed_load(path, snapshot=None)
+            json_time, loaded = timed_load(path, snapshot=False)
+            os.remove(path + ".cache")
+            cold_time, _ = timed_load(path, snapshot=True)
+            warm_time, _ = timed_load(path, snapshot=True)
+            print(f"{loaded:>7} nodes  before {before_time:6.3f}s  json {json_time:6.3f}s  cold {cold_time:6.3f}s  warm {warm_time:6.3f}s  "
+                  f"({os.path.getsize(path) / 1e6:.1f} MB json, {os.path.getsize(path + '.cache') / 1e6:.1f} MB cache)")
+
+if __name__ == "__main__":
+    main()
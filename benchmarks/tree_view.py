@@ -0,0 +1,60 @@
+"""
+Main window tree cost on a large tree: full rebuild (populate_tree, 시작/가져오기) and one status
+batch touching every node (on_results_ready), on the offscreen Qt platform.
+
+    python benchmarks/tree_view.py [node_count]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication
+from src.core.models import NodeModel, NodeStatus
+from src.core.monitor_engine import MonitorEngine
+from src.core.node_manager import NodeManager
+from src.ui.main_window import MainWindow
+
+def main():
+    node_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    app = QApplication([])
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = NodeManager(os.path.join(tmp, "tree.json"), snapshot=False)
+        with manager.bulk_edit():
+            created = 0
+            while created < node_count:
+                folder = NodeModel(f"folder-{created}")
+                manager.add_node(folder)
+                created += 1
+                for _ in range(min(999, node_count - created)):
+                    device = NodeModel(f"device-{created}")
+                    device.ip_address = f"10.{created >> 16 & 255}.{created >> 8 & 255}.{created & 255}"
+                    manager.add_node(device, folder.id)
+                    created += 1
+
+        started = time.perf_counter()
+        window = MainWindow(manager, MonitorEngine(manager))
+        window.show()
+        app.processEvents()
+        print(f"{node_count} nodes  window + tree  {time.perf_counter() - started:7.3f}s")
+
+        started = time.perf_counter()
+        window.populate_tree()
+        app.processEvents()
+        print(f"{node_count} nodes  populate_tree  {time.perf_counter() - started:7.3f}s")
+
+        devices = manager.get_all_devices()
+        for node in devices:
+            manager.set_status(node, NodeStatus.NORMAL, ping_ms=1.0)
+        started = time.perf_counter()
+        window.on_results_ready([node.id for node in devices], [])
+        app.processEvents()
+        print(f"{node_count} nodes  status batch   {time.perf_counter() - started:7.3f}s")
+        window.close()
+    os._exit(0)  # atexit flush 생략
+
+if __name__ == "__main__":
+    main()
@@ -7,7 +7,8 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from PySide6.QtWidgets import QApplication
 from src.ui.main_window import MainWindow
 from src.core.node_manager import NodeManager
-from src.core.monitor_engine import MonitorEngine
+from src.core.monitor_engine import MonitorEngine, ENGINE_MODE_SCHEDULER
+from src.core.metrics_store import MetricsStore
 
 def main():
     app = QApplication(sys.argv)
@@ -28,7 +29,12 @@ def main():
         node_manager.add_node(d1, g1.id)
         node_manager.add_node(d2, g1.id)
         
-    monitor_engine = MonitorEngine(node_manager)
+    # 검사 결과 이력은 트리 데이터 파일과 같은 위치에 저장
+    data_dir = os.path.dirname(os.path.abspath(node_manager.data_file_path))
+    metrics_store = MetricsStore(os.path.join(data_dir, "metrics.db"))
+        
+    monitor_engine = MonitorEngine(node_manager, mode=ENGINE_MODE_SCHEDULER, suppress_unreachable=True,
+                                   metrics_store=metrics_store)
     monitor_engine.start_monitoring()
     
     window = MainWindow(node_manager, monitor_engine)
@@ -36,6 +42,7 @@ def main():
     
     ret = app.exec()
     monitor_engine.stop_monitoring()
+    metrics_store.close()
     sys.exit(ret)
 
 if __name__ == "__main__":
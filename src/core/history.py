@@ -0,0 +1,105 @@
+from array import array
+from datetime import datetime
+from typing import Iterator, List, Optional
+from .models import NodeStatus
+
+HISTORY_CAPACITY = 1000  # 노드당 보관하는 최근 결과 수
+
+_STATUSES = list(NodeStatus)
+_STATUS_CODES = {status: code for code, status in enumerate(_STATUSES)}
+_EVENT = 0xFF      # 검사 결과가 아닌 텍스트 항목 (상위 노드 장애로 억제 등)
+_NO_STATS = 0xFF   # 단일 ping (손실률/지터 없음)
+
+class NodeHistory:
+    """
+    Fixed-capacity ring buffer of a node's recent probe results.
+    Each column is a typed array (about 18 bytes per entry) that grows up to `capacity`
+    and is then overwritten in place, so appends are O(1) and no strings are kept.
+    The columns are only allocated on the first append (검사하지 않는 폴더 노드는 빈 상태 유지).
+    Log lines are formatted only when lines() is called (log panel, export).
+    """
+    __slots__ = ("capacity", "_timestamps", "_ping_ms", "_port_ms", "_status", "_loss", "_jitter_ms",
+                 "_events", "_count")
+
+    def __init__(self, capacity: int = HISTORY_CAPACITY):
+        self.capacity = capacity
+        self._timestamps = None  # epoch seconds ("I"), 첫 append 때 생성
+        self._ping_ms = None     # "f"
+        self._port_ms = None     # "f"
+        self._status = None      # "B": ping code << 4 | port code, _EVENT 이면 텍스트 항목
+        self._loss = None        # "B": 다중 ping 손실률 (%), _NO_STATS 이면 단일 ping
+        self._jitter_ms = None   # "f"
+        self._events = None      # 절대 index -> 텍스트 (텍스트 항목만)
+        self._count = 0          # 지금까지 추가된 항목 수 (다음 절대 index)
+
+    def __len__(self) -> int:
+        return min(self._count, self.capacity)
+
+    def append(self, timestamp: float, ping_status: NodeStatus, ping_ms: float,
+               port_status: NodeStatus, port_ms: float,
+               loss_percent: Optional[float] = None, jitter_ms: float = 0.0):
+        status = _STATUS_CODES[ping_status] << 4 | _STATUS_CODES[port_status]
+        loss = _NO_STATS if loss_percent is None else int(round(loss_percent))
+        self._write(timestamp, status, ping_ms, port_ms, loss, jitter_ms)
+
+    def append_event(self, timestamp: float, text: str):
+        if self._events is None:
+            self._events = {}
+        self._events[self._count] = text
+        self._write(timestamp, _EVENT, 0.0, 0.0, _NO_STATS, 0.0)
+
+    def _write(self, timestamp: float, status: int, ping_ms: float, port_ms: float, loss: int, jitter_ms: float):
+        if self._timestamps is None:
+            self._timestamps = array("I")
+            self._ping_ms = array("f")
+            self._port_ms = array("f")
+            self._status = array("B")
+            self._loss = array("B")
+            self._jitter_ms = array("f")
+        if len(self._timestamps) < self.capacity:
+            self._timestamps.append(int(timestamp))
+            self._status.append(status)
+            self._ping_ms.append(ping_ms)
+            self._port_ms.append(port_ms)
+            self._loss.append(loss)
+            self._jitter_ms.append(jitter_ms)
+        else:
+            slot = self._count % self.capacity
+            self._timestamps[slot] = int(timestamp)
+            self._status[slot] = status
+            self._ping_ms[slot] = ping_ms
+            self._port_ms[slot] = port_ms
+            self._loss[slot] = loss
+            self._jitter_ms[slot] = jitter_ms
+            # 덮어쓴 칸의 텍스트 항목 정리
+            if self._events:
+                self._events.pop(self._count - self.capacity, None)
+        self._count += 1
+
+    def _indexes(self, last: Optional[int] = None) -> Iterator[int]:
+        """Absolute indexes of the retained entries, oldest first (only the newest `last` if given)."""
+        size = len(self)
+        if last is not None:
+            size = min(size, last)
+        return iter(range(self._count - size, self._count))
+
+    def lines(self, name: str, port: Optional[int] = None, last: Optional[int] = None) -> List[str]:
+        """Formats the retained entries (oldest first) as log lines."""
+        return [self._format(index, name, port) for index in self._indexes(last)]
+
+    def _format(self, index: int, name: str, port: Optional[int]) -> str:
+        slot = index % self.capacity
+        checked_at = datetime.fromtimestamp(self._timestamps[slot]).strftime("%Y-%m-%d %H:%M:%S")
+        status = self._status[slot]
+        if status == _EVENT:
+            return f"[{checked_at}] {name} | {(self._events or {}).get(index, '')}"
+
+        ping_status = _STATUSES[status >> 4]
+        port_status = _STATUSES[status & 0x0F]
+        msg = f"Ping: {ping_status.name} ({self._ping_ms[slot]:.1f}ms"
+        if self._loss[slot] != _NO_STATS:
+            msg += f", jitter {self._jitter_ms[slot]:.1f}ms, loss {self._loss[slot]}%"
+        msg += ")"
+        if port and port > 0 and port_status != NodeStatus.UNKNOWN:
+            msg += f", Port({port}): {port_status.name} ({self._port_ms[slot]:.1f}ms)"
+        return f"[{checked_at}] {name} | {msg}"
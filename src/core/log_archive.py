@@ -0,0 +1,199 @@
+import argparse
+import gzip
+import json
+import os
+import re
+import shutil
+from datetime import datetime, timedelta
+from typing import Iterator, List, Optional
+
+ARCHIVE_CHUNK_BYTES = 64 * 1024           # 노드별 압축 단위 (원본 기준), 검색 시 이 단위로만 해제
+ARCHIVE_BUFFER_BYTES = 32 * 1024 * 1024   # 압축 중 메모리에 모아두는 최대 크기
+LOG_RETENTION_DAYS = 90
+INDEX_VERSION = 1
+OTHER_LINES = ""  # 노드 로그가 아닌 줄 (오류 등) 의 index 키
+
+_DAY_FILE = re.compile(r"^(\d{4}-\d{2}-\d{2})\.txt$")
+_ARCHIVE_FILE = re.compile(r"^(\d{4}-\d{2}-\d{2})\.txt\.gz$")
+_NODE_MARKER = " [INFO] Connection Status | "
+
+def node_name_of(line: str) -> Optional[str]:
+    """Node name of a 'Connection Status | name | details' log line, None for other lines."""
+    start = line.find(_NODE_MARKER)
+    if start < 0:
+        return None
+    start += len(_NODE_MARKER)
+    end = line.find(" | ", start)
+    return line[start:end] if end >= 0 else None
+
+class LogArchive:
+    """
+    Compressed retention for the daily log files in `log_dir`.
+    A closed day (yyyy-mm-dd.txt) becomes yyyy-mm-dd.txt.gz, regrouped by node: each node's lines
+    are written as their own gzip members of up to ~ARCHIVE_CHUNK_BYTES (the file stays readable
+    with zcat). yyyy-mm-dd.idx.json maps every node name to its members as
+    [offset, length, first_time, last_time], so search() decompresses only that node's data.
+    """
+    def __init__(self, log_dir: str = "logs", retention_days: int = LOG_RETENTION_DAYS):
+        self.log_dir = log_dir
+        self.retention_days = retention_days
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.log_dir, name)
+
+    def archive_closed_days(self, today: str = None):
+        """Compresses every plain day file older than `today` and applies the retention limit."""
+        today = today or datetime.now().strftime("%Y-%m-%d")
+        for name in sorted(os.listdir(self.log_dir)):
+            match = _DAY_FILE.match(name)
+            if match and match.group(1) < today:
+                try:
+                    self.compress_day(match.group(1))
+                except OSError as e:
+                    print(f"Log archive failed for {name}: {e}")
+        self.prune(today)
+
+    def _load_index(self, date: str) -> dict:
+        try:
+            with open(self._path(f"{date}.idx.json"), "r", encoding="utf-8") as f:
+                return json.load(f)["nodes"]
+        except (OSError, ValueError, KeyError):
+            return {}
+
+    def compress_day(self, date: str):
+        """
+        Compresses yyyy-mm-dd.txt into yyyy-mm-dd.txt.gz. If the day was already archived
+        (e.g. lines written after the clock went back), the new members are appended after
+        the existing ones and the index entries are merged.
+        """
+        source = self._path(f"{date}.txt")
+        target = self._path(f"{date}.txt.gz")
+        members = {}   # node name -> [[offset, length, first_time, last_time], ...]
+        buffers = {}   # node name -> [lines, bytes]
+        buffered = 0
+
+        if os.path.exists(target):
+            members = self._load_index(date)
+            shutil.copyfile(target, target + ".tmp")
+
+        with open(source, "r", encoding="utf-8", errors="replace") as src, open(target + ".tmp", "ab") as dst:
+
+            def flush(name):
+                lines = buffers.pop(name)[0]
+                data = gzip.compress("".join(lines).encode("utf-8"))
+                members.setdefault(name, []).append([dst.tell(), len(data), lines[0][:19], lines[-1][:19]])
+                dst.write(data)
+
+            for line in src:
+                name = node_name_of(line)
+                if name is None:
+                    name = OTHER_LINES
+                buffer = buffers.get(name)
+                if buffer is None:
+                    buffer = buffers[name] = [[], 0]
+                buffer[0].append(line)
+                buffer[1] += len(line)
+                buffered += len(line)
+                if buffer[1] >= ARCHIVE_CHUNK_BYTES:
+                    buffered -= buffer[1]
+                    flush(name)
+                elif buffered >= ARCHIVE_BUFFER_BYTES:
+                    for pending in list(buffers):
+                        flush(pending)
+                    buffered = 0
+            for pending in list(buffers):
+                flush(pending)
+
+        with open(self._path(f"{date}.idx.json.tmp"), "w", encoding="utf-8") as f:
+            json.dump({"version": INDEX_VERSION, "nodes": members}, f, ensure_ascii=False)
+        os.replace(target + ".tmp", target)
+        os.replace(self._path(f"{date}.idx.json.tmp"), self._path(f"{date}.idx.json"))
+        os.remove(source)
+
+    def prune(self, today: str = None):
+        """Deletes archived days older than the retention limit."""
+        today = today or datetime.now().strftime("%Y-%m-%d")
+        cutoff = (datetime.strptime(today, "%Y-%m-%d") - timedelta(days=self.retention_days)).strftime("%Y-%m-%d")
+        for name in os.listdir(self.log_dir):
+            match = _DAY_FILE.match(name) or _ARCHIVE_FILE.match(name)
+            if match and match.group(1) < cutoff:
+                for path in (self._path(name), self._path(f"{match.group(1)}.idx.json")):
+                    if os.path.exists(path):
+                        os.remove(path)
+
+    def days(self) -> List[str]:
+        """Dates with a plain or archived log file, oldest first."""
+        dates = set()
+        for name in os.listdir(self.log_dir):
+            match = _DAY_FILE.match(name) or _ARCHIVE_FILE.match(name)
+            if match:
+                dates.add(match.group(1))
+        return sorted(dates)
+
+    def search(self, node_name: str, since: str = None, until: str = None) -> Iterator[str]:
+        """
+        Yields a node's log lines (oldest first) for the days between since and until
+        (yyyy-mm-dd, inclusive). Archived days only decompress the members indexed for the node.
+        """
+        for date in self.days():
+            if (since and date < since) or (until and date > until):
+                continue
+            archived = self._path(f"{date}.txt.gz")
+            entries = self._load_index(date).get(node_name) if os.path.exists(archived) else None
+            if entries:
+                with open(archived, "rb") as f:
+                    for offset, length, _, _ in entries:
+                        f.seek(offset)
+                        text = gzip.decompress(f.read(length)).decode("utf-8", errors="replace")
+                        for line in text.splitlines():
+                            if node_name_of(line) == node_name:
+                                yield line
+
+            plain = self._path(f"{date}.txt")
+            if os.path.exists(plain):
+                # 오늘 (아직 압축 전) 파일은 그대로 검색
+                with open(plain, "r", encoding="utf-8", errors="replace") as f:
+                    for line in f:
+                        if node_name_of(line) == node_name:
+                            yield line.rstrip("\n")
+
+    def node_summary(self, node_name: str) -> List[tuple]:
+        """(date, first_time, last_time) per archived day in which the node appears (index only)."""
+        summary = []
+        for date in self.days():
+            entries = self._load_index(date).get(node_name)
+            if entries:
+                summary.append((date, min(entry[2] for entry in entries), max(entry[3] for entry in entries)))
+        return summary
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m src.core.log_archive",
+                                     description="PingForest 로그 보관/검색")
+    parser.add_argument("--log-dir", default="logs")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    search = sub.add_parser("search", help="노드의 로그를 여러 날짜에 걸쳐 검색")
+    search.add_argument("node_name")
+    search.add_argument("--since", help="yyyy-mm-dd")
+    search.add_argument("--until", help="yyyy-mm-dd")
+
+    summary = sub.add_parser("summary", help="노드가 기록된 날짜와 처음/마지막 시각 (인덱스만 사용)")
+    summary.add_argument("node_name")
+
+    archive = sub.add_parser("archive", help="지난 날짜 로그 압축 및 보관 기간 적용")
+    archive.add_argument("--retention-days", type=int, default=LOG_RETENTION_DAYS)
+
+    args = parser.parse_args(argv)
+    if args.command == "archive":
+        LogArchive(args.log_dir, args.retention_days).archive_closed_days()
+        return
+    log_archive = LogArchive(args.log_dir)
+    if args.command == "search":
+        for line in log_archive.search(args.node_name, args.since, args.until):
+            print(line)
+    elif args.command == "summary":
+        for date, first, last in log_archive.node_summary(args.node_name):
+            print(f"{date}  {first} ~ {last}")
+
+if __name__ == "__main__":
+    main()
@@ -1,54 +1,170 @@
-import logging
+import atexit
 import os
-from datetime import datetime
+import sys
+import threading
+import time
+from collections import deque
+from .log_archive import LOG_RETENTION_DAYS, LogArchive
+
+RATE_WINDOW = 5.0  # lines_per_second 계산 구간 (초)
 
 class AppLogger:
-    def __init__(self, log_dir: str = "logs"):
+    """
+    Asynchronous, batched application logger (logs/yyyy-mm-dd.txt + console).
+    log_*() only appends to a bounded in-memory queue, so callers (GUI thread, probe loop)
+    never wait on the disk. A background writer drains the queue in batches, flushing once
+    `batch_size` lines are waiting or every `flush_interval` seconds, and checks the daily
+    rollover once per batch. When the queue is full new lines are dropped and counted.
+    Closed days are compressed and indexed by `archive` (see LogArchive) on the writer thread.
+    """
+    def __init__(self, log_dir: str = "logs", max_queue: int = 100000, batch_size: int = 1000,
+                 flush_interval: float = 0.5, console: bool = True, retention_days: int = LOG_RETENTION_DAYS):
         self.log_dir = log_dir
         if not os.path.exists(self.log_dir):
             os.makedirs(self.log_dir)
-            
-        self.logger = logging.getLogger("PingForest")
-        self.logger.setLevel(logging.INFO)
-        
+        self.archive = LogArchive(log_dir, retention_days)
+
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.console = console
+
+        self._queue = deque()  # (created_time, level, message)
+        self._wakeup = threading.Event()
+        self._written_cond = threading.Condition()
+        self._closed = False
+
         self.current_log_date = None
-        self._check_rollover()
-
-    def _check_rollover(self):
-        current_date = datetime.now().strftime("%Y-%m-%d")
-        if current_date != getattr(self, "current_log_date", None):
-            self.current_log_date = current_date
-            
-            for h in list(self.logger.handlers):
-                if isinstance(h, logging.FileHandler):
-                    self.logger.removeHandler(h)
-                    
-            log_file = os.path.join(self.log_dir, f"{current_date}.txt")
-            file_handler = logging.FileHandler(log_file, encoding='utf-8')
-            file_handler.setLevel(logging.INFO)
-            
-            formatter = logging.Formatter('%(asctime)s [%(levelname)s] %(message)s', datefmt='%Y-%m-%d %H:%M:%S')
-            file_handler.setFormatter(formatter)
-            self.logger.addHandler(file_handler)
-            
-            has_console = any(isinstance(h, logging.StreamHandler) and not isinstance(h, logging.FileHandler) for h in self.logger.handlers)
-            if not has_console:
-                console_handler = logging.StreamHandler()
-                console_handler.setLevel(logging.DEBUG)
-                console_handler.setFormatter(formatter)
-                self.logger.addHandler(console_handler)
+        self._file = None
+
+        # 처리량 측정
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self._started = time.monotonic()
+        self._recent_batches = deque()  # (monotonic, 줄 수), 최근 RATE_WINDOW 초
+
+        self._thread = threading.Thread(target=self._run, name="app-logger", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _enqueue(self, level: str, message: str):
+        if len(self._queue) >= self.max_queue:
+            # 디스크가 막혀도 호출자를 기다리게 하지 않음 (새 로그를 버림)
+            self.dropped += 1
+            return
+        self.enqueued += 1
+        self._queue.append((time.time(), level, message))
+        if len(self._queue) >= self.batch_size:
+            self._wakeup.set()
 
     def log_info(self, message: str):
-        self._check_rollover()
-        self.logger.info(message)
+        self._enqueue("INFO", message)
 
     def log_error(self, message: str):
-        self._check_rollover()
-        self.logger.error(message)
-        
+        self._enqueue("ERROR", message)
+
     def log_connection_status(self, node_name: str, details: str):
-        self._check_rollover()
-        self.logger.info(f"Connection Status | {node_name} | {details}")
+        self._enqueue("INFO", f"Connection Status | {node_name} | {details}")
+
+    def flush(self, timeout: float = None) -> bool:
+        """Blocks until every line queued so far has been written. Returns False on timeout."""
+        target = self.enqueued
+        self._wakeup.set()
+        with self._written_cond:
+            return self._written_cond.wait_for(lambda: self.written >= target, timeout)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._wakeup.set()
+        self._thread.join()
+
+    def stats(self) -> dict:
+        """Written/dropped line counts, queue depth and throughput in lines per second."""
+        now = time.monotonic()
+        recent = [count for at, count in list(self._recent_batches) if now - at <= RATE_WINDOW]
+        return {
+            "written": self.written,
+            "dropped": self.dropped,
+            "queued": len(self._queue),
+            "lines_per_second": sum(recent) / RATE_WINDOW,
+            "average_lines_per_second": self.written / max(now - self._started, 1e-9),
+        }
+
+    # --- 백그라운드 writer ---
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            while self._queue:
+                self._write_batch([self._queue.popleft() for _ in range(min(len(self._queue), self.batch_size))])
+            if self._closed and not self._queue:
+                break
+        if self._file is not None:
+            self._file.close()
+
+    def _write_batch(self, records):
+        lines = []
+        last_second = None
+        stamp = ""
+        for created, level, message in records:
+            second = int(created)
+            if second != last_second:
+                # 같은 초의 로그는 시각 문자열을 재사용
+                last_second = second
+                stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(second))
+                date = stamp[:10]
+                # 날짜는 앞으로만 넘어감: 시계가 되돌아가거나 늦게 들어온 지난 날짜 로그는
+                # 현재 파일에 기록 (이미 압축된 날짜 파일을 다시 만들지 않도록)
+                if self.current_log_date is None or date > self.current_log_date:
+                    self._write_lines(lines)
+                    lines = []
+                    self._check_rollover(date)
+            lines.append(f"{stamp} [{level}] {message}\n")
+        self._write_lines(lines)
+
+        now = time.monotonic()
+        self._recent_batches.append((now, len(records)))
+        while now - self._recent_batches[0][0] > RATE_WINDOW:
+            self._recent_batches.popleft()
+        with self._written_cond:
+            self.written += len(records)
+            self._written_cond.notify_all()
+
+    def _check_rollover(self, date: str):
+        self.current_log_date = date
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        log_file = os.path.join(self.log_dir, f"{date}.txt")
+        try:
+            self._file = open(log_file, "a", encoding="utf-8")
+        except OSError as e:
+            print(f"Log file open failed: {e}", file=sys.stderr)
+        # 지난 날짜 파일 압축 + 보관 기간 적용 (시작 시와 날짜가 바뀔 때만, 기록은 멈추지 않음)
+        threading.Thread(target=self._archive_closed_days, args=(date,), name="log-archive", daemon=True).start()
+
+    def _archive_closed_days(self, today: str):
+        try:
+            self.archive.archive_closed_days(today)
+        except OSError as e:
+            print(f"Log archive failed: {e}", file=sys.stderr)
+
+    def _write_lines(self, lines):
+        if not lines:
+            return
+        text = "".join(lines)
+        try:
+            if self._file is not None:
+                self._file.write(text)
+                self._file.flush()
+        except OSError as e:
+            print(f"Log write failed: {e}", file=sys.stderr)
+        if self.console:
+            sys.stderr.write(text)
 
 # Singleton-like instance for quick use
 global_logger = AppLogger()
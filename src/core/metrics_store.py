@@ -0,0 +1,246 @@
+import math
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import closing
+from typing import List, Optional, Tuple
+from .models import NodeStatus
+
+# 보관 기간 (일)
+RAW_RETENTION_DAYS = 7
+MINUTE_RETENTION_DAYS = 90
+HOUR_RETENTION_DAYS = 730
+
+ROLLUP_GRACE_SECONDS = 5  # 구간이 끝난 뒤 늦게 도착하는 결과를 기다리는 시간 (더 늦은 결과는 해당 구간을 다시 집계)
+MAX_PENDING_SAMPLES = 100000  # 디스크에 쓰지 못한 결과를 메모리에 쌓아두는 최대 개수
+
+RESOLUTION_RAW = "raw"
+RESOLUTION_MINUTE = "1m"
+RESOLUTION_HOUR = "1h"
+
+_ROLLUP_TABLES = {RESOLUTION_MINUTE: ("rollup_1m", 60), RESOLUTION_HOUR: ("rollup_1h", 3600)}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS samples (
+    node_id TEXT NOT NULL,
+    ts INTEGER NOT NULL,          -- epoch ms
+    ping_status INTEGER NOT NULL, -- NodeStatus 순서 (models.NodeStatus)
+    ping_ms REAL NOT NULL,
+    port_status INTEGER NOT NULL,
+    port_ms REAL NOT NULL,
+    loss REAL NOT NULL,           -- ping 손실률 (%)
+    PRIMARY KEY (node_id, ts)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS samples_ts ON samples (ts);
+CREATE TABLE IF NOT EXISTS rollup_1m (
+    node_id TEXT NOT NULL, bucket INTEGER NOT NULL, count INTEGER NOT NULL,
+    min_ms REAL, avg_ms REAL, max_ms REAL, p95_ms REAL, loss REAL NOT NULL,
+    PRIMARY KEY (node_id, bucket)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS rollup_1h (
+    node_id TEXT NOT NULL, bucket INTEGER NOT NULL, count INTEGER NOT NULL,
+    min_ms REAL, avg_ms REAL, max_ms REAL, p95_ms REAL, loss REAL NOT NULL,
+    PRIMARY KEY (node_id, bucket)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+"""
+
+_STATUSES = list(NodeStatus)
+_STATUS_CODES = {status: code for code, status in enumerate(_STATUSES)}
+_UP_CODES = (_STATUS_CODES[NodeStatus.NORMAL], _STATUS_CODES[NodeStatus.WARNING])
+
+def percentile(sorted_values: List[float], fraction: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+class MetricsStore:
+    """
+    On-disk time-series store for probe results (SQLite in WAL mode).
+    record() only appends to an in-memory queue; a background thread batch-inserts raw samples
+    every `flush_interval` seconds, builds 1-minute and 1-hour rollups (min/avg/max/p95/loss)
+    once each bucket has closed, and applies the retention limits. Samples that arrive after
+    their bucket was rolled up re-aggregate that bucket.
+    A failed write (locked database, full disk) is retried on the next flush; the queue holds at
+    most `max_pending` samples and newer ones are dropped (and counted) while it is full.
+    Samples are keyed by (node_id, ts in ms): a second sample for the same node and millisecond
+    is a duplicate delivery; the first one is kept and the rest are counted in `duplicates`.
+    """
+    def __init__(self, path: str = "metrics.db", flush_interval: float = 2.0,
+                 raw_retention_days: int = RAW_RETENTION_DAYS,
+                 minute_retention_days: int = MINUTE_RETENTION_DAYS,
+                 hour_retention_days: int = HOUR_RETENTION_DAYS,
+                 max_pending: int = MAX_PENDING_SAMPLES):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.dropped = 0
+        self.duplicates = 0  # 같은 (node_id, ts) 로 들어와 저장하지 않은 결과
+        self.retention = {
+            "samples": raw_retention_days * 86400,
+            "rollup_1m": minute_retention_days * 86400,
+            "rollup_1h": hour_retention_days * 86400,
+        }
+        self._pending = deque()  # (node_id, ts_ms, ping_code, ping_ms, port_code, port_ms, loss)
+        self._stop = threading.Event()
+        self._last_retention = 0.0
+
+        with closing(self._connect()) as conn:
+            conn.executescript(_SCHEMA)
+
+        self._thread = threading.Thread(target=self._run, name="metrics-writer", daemon=True)
+        self._thread.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def record(self, node_id: str, timestamp: float, ping_status: NodeStatus, ping_ms: float,
+               port_status: NodeStatus, port_ms: float, loss_percent: Optional[float] = None):
+        """Queues one probe result (thread-safe, never touches the disk)."""
+        if loss_percent is None:
+            loss_percent = 0.0 if ping_status in (NodeStatus.NORMAL, NodeStatus.WARNING) else 100.0
+        if len(self._pending) >= self.max_pending:
+            # 디스크 쓰기가 계속 실패해도 메모리가 끝없이 늘지 않도록 새 결과를 버림
+            self.dropped += 1
+            return
+        self._pending.append((node_id, int(timestamp * 1000), _STATUS_CODES[ping_status], ping_ms,
+                              _STATUS_CODES[port_status], port_ms, loss_percent))
+
+    def close(self):
+        """Flushes everything still queued and stops the writer thread."""
+        self._stop.set()
+        self._thread.join()
+
+    # --- 백그라운드 writer ---
+
+    def _run(self):
+        conn = self._connect()
+        try:
+            while not self._stop.wait(self.flush_interval):
+                self._flush_or_requeue(conn)
+            self._flush_or_requeue(conn)
+        finally:
+            conn.close()
+
+    def _flush_or_requeue(self, conn: sqlite3.Connection):
+        rows = [self._pending.popleft() for _ in range(len(self._pending))]
+        try:
+            self._flush(conn, rows)
+        except sqlite3.Error as e:
+            # writer 는 계속 동작, 실패한 batch 는 다음 주기에 다시 시도 (한도를 넘는 만큼은 버림)
+            print(f"Metrics store error: {e}")
+            room = max(0, self.max_pending - len(self._pending))
+            if len(rows) > room:
+                self.dropped += len(rows) - room
+                rows = rows[:room]
+            self._pending.extendleft(reversed(rows))
+
+    def _flush(self, conn: sqlite3.Connection, rows: list):
+        now = time.time()
+        duplicates = 0
+        with conn:
+            if rows:
+                inserted = conn.total_changes
+                conn.executemany("INSERT OR IGNORE INTO samples VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+                duplicates = len(rows) - (conn.total_changes - inserted)
+            for resolution in (RESOLUTION_MINUTE, RESOLUTION_HOUR):
+                if rows:
+                    self._reroll_late(conn, resolution, rows)
+                self._roll_up(conn, resolution, now)
+            if now - self._last_retention > 3600:
+                self._last_retention = now
+                for table, seconds in self.retention.items():
+                    column = "ts" if table == "samples" else "bucket"
+                    conn.execute(f"DELETE FROM {table} WHERE {column} < ?", (int((now - seconds) * 1000),))
+        self.duplicates += duplicates  # commit 된 batch 만 (재시도 시 중복 집계 방지)
+
+    def _reroll_late(self, conn: sqlite3.Connection, resolution: str, rows: list):
+        """Re-aggregates already rolled-up buckets that received late samples in this batch."""
+        table, seconds = _ROLLUP_TABLES[resolution]
+        span_ms = seconds * 1000
+        row = conn.execute("SELECT value FROM meta WHERE key = ?", (table,)).fetchone()
+        if row is None:
+            return
+        rolled_until = row[0]
+        late = {(node_id, ts - ts % span_ms) for node_id, ts, *_ in rows if ts < rolled_until}
+        for node_id, bucket in late:
+            self._write_rollups(conn, table, span_ms, "node_id = ? AND ts >= ? AND ts < ?",
+                                (node_id, bucket, bucket + span_ms))
+
+    def _roll_up(self, conn: sqlite3.Connection, resolution: str, now: float):
+        """Aggregates raw samples of every bucket that closed since the last run."""
+        table, seconds = _ROLLUP_TABLES[resolution]
+        span_ms = seconds * 1000
+        closed_until = int((now - ROLLUP_GRACE_SECONDS) // seconds) * span_ms
+        row = conn.execute("SELECT value FROM meta WHERE key = ?", (table,)).fetchone()
+        if row is None:
+            # 처음 실행: 현재 구간부터 집계 시작
+            conn.execute("INSERT INTO meta VALUES (?, ?)", (table, closed_until))
+            return
+        rolled_until = row[0]
+        if closed_until <= rolled_until:
+            return
+
+        self._write_rollups(conn, table, span_ms, "ts >= ? AND ts < ?", (rolled_until, closed_until))
+        conn.execute("UPDATE meta SET value = ? WHERE key = ?", (closed_until, table))
+
+    def _write_rollups(self, conn: sqlite3.Connection, table: str, span_ms: int, where: str, params: tuple):
+        """Aggregates the raw samples matching `where` into `table` buckets (min/avg/max/p95/loss)."""
+        groups = {}  # (node_id, bucket) -> [rtts of successful samples, loss total, count]
+        cursor = conn.execute(f"SELECT node_id, ts, ping_status, ping_ms, loss FROM samples WHERE {where}", params)
+        for node_id, ts, ping_code, ping_ms, loss in cursor:
+            group = groups.get((node_id, ts - ts % span_ms))
+            if group is None:
+                group = groups[(node_id, ts - ts % span_ms)] = [[], 0.0, 0]
+            if ping_code in _UP_CODES:
+                group[0].append(ping_ms)
+            group[1] += loss
+            group[2] += 1
+
+        rollups = []
+        for (node_id, bucket), (rtts, loss_total, count) in groups.items():
+            rtts.sort()
+            rollups.append((node_id, bucket, count,
+                            rtts[0] if rtts else None,
+                            sum(rtts) / len(rtts) if rtts else None,
+                            rtts[-1] if rtts else None,
+                            percentile(rtts, 0.95),
+                            loss_total / count))
+        conn.executemany(f"INSERT OR REPLACE INTO {table} VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rollups)
+
+    # --- 조회 ---
+
+    def query(self, node_id: str, start: float, end: float, resolution: str = None) -> List[Tuple]:
+        """
+        Returns a node's history between two epoch timestamps (seconds), oldest first.
+        raw rows:    (timestamp, ping_status, ping_ms, port_status, port_ms, loss)
+        rollup rows: (timestamp, count, min_ms, avg_ms, max_ms, p95_ms, loss)
+        Without a resolution, raw is used up to 6 hours, 1m up to 7 days and 1h beyond that.
+        """
+        if resolution is None:
+            span = end - start
+            resolution = (RESOLUTION_RAW if span <= 6 * 3600 else
+                          RESOLUTION_MINUTE if span <= 7 * 86400 else RESOLUTION_HOUR)
+        start_ms, end_ms = int(start * 1000), int(end * 1000)
+
+        with closing(self._connect()) as conn:
+            if resolution == RESOLUTION_RAW:
+                rows = conn.execute(
+                    "SELECT ts, ping_status, ping_ms, port_status, port_ms, loss FROM samples "
+                    "WHERE node_id = ? AND ts >= ? AND ts < ? ORDER BY ts",
+                    (node_id, start_ms, end_ms)).fetchall()
+                return [(ts / 1000.0, _STATUSES[ping], ping_ms, _STATUSES[port], port_ms, loss)
+                        for ts, ping, ping_ms, port, port_ms, loss in rows]
+
+            table, _ = _ROLLUP_TABLES[resolution]
+            rows = conn.execute(
+                f"SELECT bucket, count, min_ms, avg_ms, max_ms, p95_ms, loss FROM {table} "
+                "WHERE node_id = ? AND bucket >= ? AND bucket < ? ORDER BY bucket",
+                (node_id, start_ms, end_ms)).fetchall()
+            return [(bucket / 1000.0,) + tuple(rest) for bucket, *rest in rows]
@@ -1,19 +1,33 @@
+import sys
 import uuid
 from enum import Enum
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 class NodeStatus(Enum):
     NORMAL = "normal"      # 초록색 (정상)
     WARNING = "warning"    # 노란색 (불안/응답지연 등)
     DEAD = "dead"          # 빨간색 (연결 실패)
     UNKNOWN = "unknown"    # 회색 (검사 전)
+    UNREACHABLE = "unreachable"  # 어두운 회색 (상위 노드 장애로 도달 불가)
 
 class NodeType(Enum):
     DEVICE = "device"
 
 class NodeModel:
-    def __init__(self, name: str, node_type: NodeType = NodeType.DEVICE):
-        self.id = str(uuid.uuid4())
+    # __dict__ 대신 고정 slot 사용 (노드 수가 많을 때 메모리 절약)
+    __slots__ = (
+        "id", "name", "type", "ip_address", "port", "check_interval_seconds",
+        "adaptive_interval", "max_check_interval_seconds",
+        "ping_count", "ping_spacing_ms", "warning_latency_ms", "warning_loss_percent", "dead_loss_percent",
+        "enable_email_alert", "alert_threshold_count", "alert_emails", "alert_interval_minutes",
+        "ping_status", "port_status", "last_check_time", "ping_response_time_ms", "port_response_time_ms",
+        "ping_loss_percent", "ping_jitter_ms", "unreachable_via",
+        "send_to_dashboard", "dashboard_color", "dashboard_icon",
+        "history", "parent_id", "children",
+    )
+
+    def __init__(self, name: str, node_type: NodeType = NodeType.DEVICE, node_id: Optional[str] = None):
+        self.id = node_id or str(uuid.uuid4())
         self.name = name
         self.type = node_type
         
@@ -22,10 +36,21 @@ class NodeModel:
         self.port: Optional[int] = None
         self.check_interval_seconds: int = 60
         
+        # 적응형 주기: 안정적인 노드는 max_check_interval_seconds 까지 점점 덜 검사
+        self.adaptive_interval: bool = False
+        self.max_check_interval_seconds: int = 600
+        
+        # 다중 ping: ping_count 개를 ping_spacing_ms 간격으로 보내 손실률/지터로 상태 판정
+        self.ping_count: int = 1
+        self.ping_spacing_ms: int = 200
+        self.warning_latency_ms: int = 0       # 평균 RTT 가 이 값을 넘으면 WARNING (0 이면 사용 안함)
+        self.warning_loss_percent: int = 20    # 손실률이 이 값 이상이면 WARNING
+        self.dead_loss_percent: int = 100      # 손실률이 이 값 이상이면 DEAD
+        
         # 알림 설정
         self.enable_email_alert: bool = False
         self.alert_threshold_count: int = 3
-        self.alert_emails: List[str] = []
+        self.alert_emails: Tuple[str, ...] = ()  # 대부분 비어 있으므로 공유되는 빈 tuple
         self.alert_interval_minutes: int = 30
         
         # 상태 정보
@@ -34,20 +59,24 @@ class NodeModel:
         self.last_check_time: str = ""
         self.ping_response_time_ms: float = 0.0
         self.port_response_time_ms: float = 0.0
+        self.ping_loss_percent: float = 0.0
+        self.ping_jitter_ms: float = 0.0
+        self.unreachable_via: Optional[str] = None  # 장애 중인 상위 노드 id (검사 억제 중)
         
         # 대시보드 설정
         self.send_to_dashboard: bool = True
         self.dashboard_color: str = "#ffffff"
         self.dashboard_icon: str = "fa5s.desktop"
         
-        # 런타임 로그 (휘발성)
-        self.logs: List[str] = []
+        # 런타임 검사 이력 (휘발성, 고정 크기 ring buffer / 로그 문자열은 필요할 때만 생성)
+        from .history import NodeHistory  # 순환 import 방지
+        self.history = NodeHistory()
         
         # 트리 구조
         self.parent_id: Optional[str] = None
         self.children: List['NodeModel'] = []
 
-    def to_dict(self):
+    def to_dict(self, recursive: bool = True):
         return {
             "id": self.id,
             "name": self.name,
@@ -55,32 +84,83 @@ class NodeModel:
             "ip_address": self.ip_address,
             "port": self.port,
             "check_interval_seconds": self.check_interval_seconds,
+            "adaptive_interval": self.adaptive_interval,
+            "max_check_interval_seconds": self.max_check_interval_seconds,
+            "ping_count": self.ping_count,
+            "ping_spacing_ms": self.ping_spacing_ms,
+            "warning_latency_ms": self.warning_latency_ms,
+            "warning_loss_percent": self.warning_loss_percent,
+            "dead_loss_percent": self.dead_loss_percent,
             "enable_email_alert": self.enable_email_alert,
             "alert_threshold_count": self.alert_threshold_count,
-            "alert_emails": self.alert_emails,
+            "alert_emails": list(self.alert_emails),
             "alert_interval_minutes": self.alert_interval_minutes,
             "send_to_dashboard": self.send_to_dashboard,
             "dashboard_color": self.dashboard_color,
             "dashboard_icon": self.dashboard_icon,
-            "children": [child.to_dict() for child in self.children]
+            "children": [child.to_dict() for child in self.children] if recursive else []
         }
 
+    def probe_config(self) -> dict:
+        """Probe-relevant subset of to_dict() (shard 프로세스 전달용, children 제외)"""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "ip_address": self.ip_address,
+            "port": self.port,
+            "check_interval_seconds": self.check_interval_seconds,
+            "adaptive_interval": self.adaptive_interval,
+            "max_check_interval_seconds": self.max_check_interval_seconds,
+            "ping_count": self.ping_count,
+            "ping_spacing_ms": self.ping_spacing_ms,
+            "warning_latency_ms": self.warning_latency_ms,
+            "warning_loss_percent": self.warning_loss_percent,
+            "dead_loss_percent": self.dead_loss_percent,
+        }
+
+    def probe_signature(self) -> tuple:
+        """Values that require rescheduling when they change (이름 변경 등은 제외)"""
+        return (self.ip_address, self.port, self.check_interval_seconds,
+                self.adaptive_interval, self.max_check_interval_seconds,
+                self.ping_count, self.ping_spacing_ms, self.warning_latency_ms,
+                self.warning_loss_percent, self.dead_loss_percent)
+
+    def classify_ping(self, loss_percent: float, latency_ms: float) -> NodeStatus:
+        """Derives the ping status from packet loss and average RTT using this node's thresholds."""
+        if loss_percent >= 100.0 or loss_percent >= self.dead_loss_percent:
+            return NodeStatus.DEAD
+        if self.warning_loss_percent and loss_percent >= self.warning_loss_percent:
+            return NodeStatus.WARNING
+        if self.warning_latency_ms and latency_ms > self.warning_latency_ms:
+            return NodeStatus.WARNING
+        return NodeStatus.NORMAL
+
     @classmethod
-    def from_dict(cls, data: dict, parent_id: Optional[str] = None):
+    def from_dict(cls, data: dict, parent_id: Optional[str] = None, recursive: bool = True):
+        """Builds a node from to_dict() output; recursive=False skips the children (반복 로더용)."""
         # 마이그레이션: 기존 group 타입도 device로 강제 변환
-        node = cls(data["name"], NodeType.DEVICE)
-        node.id = data.get("id", str(uuid.uuid4()))
+        node = cls(data["name"], NodeType.DEVICE, data.get("id"))
         node.ip_address = data.get("ip_address", "")
         node.port = data.get("port")
         node.check_interval_seconds = data.get("check_interval_seconds", 60)
+        node.adaptive_interval = data.get("adaptive_interval", False)
+        node.max_check_interval_seconds = data.get("max_check_interval_seconds", 600)
+        node.ping_count = data.get("ping_count", 1)
+        node.ping_spacing_ms = data.get("ping_spacing_ms", 200)
+        node.warning_latency_ms = data.get("warning_latency_ms", 0)
+        node.warning_loss_percent = data.get("warning_loss_percent", 20)
+        node.dead_loss_percent = data.get("dead_loss_percent", 100)
         node.enable_email_alert = data.get("enable_email_alert", False)
         node.alert_threshold_count = data.get("alert_threshold_count", 3)
-        node.alert_emails = data.get("alert_emails", [])
+        node.alert_emails = tuple(data.get("alert_emails", ()))
         node.alert_interval_minutes = data.get("alert_interval_minutes", 30)
         node.send_to_dashboard = data.get("send_to_dashboard", True)
-        node.dashboard_color = data.get("dashboard_color", "#ffffff")
-        node.dashboard_icon = data.get("dashboard_icon", "fa5s.desktop")
+        # 같은 값이 노드마다 반복되는 문자열은 intern 해서 하나만 보관
+        node.dashboard_color = sys.intern(data.get("dashboard_color", "#ffffff"))
+        node.dashboard_icon = sys.intern(data.get("dashboard_icon", "fa5s.desktop"))
         node.parent_id = parent_id
+        if not recursive:
+            return node
         
         for child_data in data.get("children", []):
             child_node = cls.from_dict(child_data, parent_id=node.id)
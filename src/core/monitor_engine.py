@@ -1,111 +1,465 @@
+import queue
 import time
+from collections import deque
 from datetime import datetime
-from PySide6.QtCore import QThread, Signal, QObject
+from PySide6.QtCore import QThread, Signal, QObject, QTimer, Qt
 from .models import NodeModel, NodeStatus, NodeType
-from src.services.ping_service import PingService
+from .probe_scheduler import AdaptiveIntervalPolicy, ProbeCoalescer, ProbeScheduler, ping_key, port_key
+from .shard_engine import ShardPool
+from src.services.ping_service import PingService, PingStats
 from src.services.port_service import PortService
 
+# 엔진 동작 모드
+ENGINE_MODE_THREAD = "thread"        # 노드당 QThread 하나 (기존 방식)
+ENGINE_MODE_SCHEDULER = "scheduler"  # 단일 이벤트 루프 + 우선순위 큐
+ENGINE_MODE_SHARDED = "sharded"      # 코어별 프로세스에 노드를 분산 (대규모 트리)
+
+UI_FLUSH_INTERVAL_MS = 100  # 검사 결과를 UI 로 묶어서 전달하는 주기 (프레임 단위)
+
+def probe_node(node: NodeModel, coalescer: ProbeCoalescer = None):
+    """
+    Runs the ping (and optional port) check for a node.
+    With a coalescer, a recent result for the same target is reused instead of probing again.
+    Returns the result_ready payload:
+    (node_id, ping_status, ping_time, port_status, port_time, checked_at, ping_stats)
+    where ping_stats is the PingStats of a multi-sample ping, None for a single ping.
+    """
+    checked_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    def run(key, check):
+        if coalescer is None:
+            return check()
+        started = time.monotonic()
+        cached, pending = coalescer.plan([key], started)
+        if not pending:
+            return cached[key]
+        result = check()
+        coalescer.record({key: result}, started)
+        return result
+
+    # Check Ping
+    if node.ping_count > 1:
+        check = lambda: PingService.check_ping_burst(node.ip_address, node.ping_count, node.ping_spacing_ms)
+    else:
+        check = lambda: PingStats.single(*PingService.check_ping(node.ip_address))
+    stats = run(ping_key(node), check)
+    ping_status = node.classify_ping(stats.loss_percent, stats.avg_ms)
+    ping_time = stats.avg_ms
+
+    # Check Port
+    port_status = NodeStatus.UNKNOWN
+    port_time = 0.0
+    if node.port and node.port > 0:
+        port_success, port_time = run(port_key(node), lambda: PortService.check_port(node.ip_address, node.port))
+        port_status = NodeStatus.NORMAL if port_success else NodeStatus.DEAD
+
+    return node.id, ping_status, ping_time, port_status, port_time, checked_at, stats if node.ping_count > 1 else None
 class MonitorWorker(QThread):
-    # node_id, ping_status, ping_response_time, port_status, port_response_time, checked_at
-    result_ready = Signal(str, object, float, object, float, str)
+    # node_id, ping_status, ping_response_time, port_status, port_response_time, checked_at, ping_stats
+    result_ready = Signal(str, object, float, object, float, str, object)
     
-    def __init__(self, node: NodeModel):
+    def __init__(self, node: NodeModel, coalescer: ProbeCoalescer = None, unreachable_interval_seconds: int = 0):
         super().__init__()
         self.node = node
+        self.coalescer = coalescer
+        # 상위 노드 장애로 억제된 동안의 느린 검사 주기 (0 이면 검사 중지)
+        self.unreachable_interval_seconds = unreachable_interval_seconds
+        # adaptive_interval 노드는 scheduler 모드와 같은 정책으로 주기를 늘림 (worker 재시작 시 초기화)
+        self.policy = AdaptiveIntervalPolicy()
         self.is_running = True
         
     def run(self):
         while self.is_running:
             try:
-                # IP 주소가 없으면 알림/검사 제외 (단순 폴더 역할)
-                if not self.node.ip_address:
+                # IP 주소가 없으면 알림/검사 제외 (단순 폴더 역할), 상위 노드 장애 중이면 억제
+                suppressed = bool(self.node.unreachable_via)
+                if not self.node.ip_address or (suppressed and not self.unreachable_interval_seconds):
                     time.sleep(1)
                     continue
                     
-                checked_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                
-                # Check Ping
-                ping_success, ping_time = PingService.check_ping(self.node.ip_address)
-                ping_status = NodeStatus.NORMAL if ping_success else NodeStatus.DEAD
-                
-                # Check Port
-                port_status = NodeStatus.UNKNOWN
-                port_time = 0.0
-                if self.node.port and self.node.port > 0:
-                    port_success, port_time = PortService.check_port(self.node.ip_address, self.node.port)
-                    port_status = NodeStatus.NORMAL if port_success else NodeStatus.DEAD
-                
                 # Signal the UI
-                self.result_ready.emit(self.node.id, ping_status, ping_time, port_status, port_time, checked_at)
+                result = probe_node(self.node, self.coalescer)
+                self.policy.observe(self.node, (result[1], result[3]), result[2])
+                self.result_ready.emit(*result)
                 
             except Exception as e:
                 print(f"Error checking node {self.node.name}: {e}")
                 
             # Sleep until next check
             # For simplicity, sleep in chunks to allow thread to be stopped gracefully
-            sleep_time = self.node.check_interval_seconds
-            for _ in range(int(sleep_time)):
-                if not self.is_running:
-                    break
-                time.sleep(1)
+            sleep_time = self.policy.interval_for(self.node)
+            if suppressed:
+                sleep_time = max(sleep_time, self.unreachable_interval_seconds)
+            while sleep_time > 0 and self.is_running:
+                if suppressed and not self.node.unreachable_via:
+                    break  # 억제 해제: 느린 주기를 기다리지 않고 바로 검사
+                time.sleep(min(1.0, sleep_time))
+                sleep_time -= 1.0
+
+    def stop(self):
+        self.is_running = False
+class SchedulerThread(QThread):
+    """Hosts a ProbeScheduler's event loop and re-emits its results as a Qt signal."""
+    # node_id, ping_status, ping_response_time, port_status, port_response_time, checked_at, ping_stats
+    result_ready = Signal(str, object, float, object, float, str, object)
+
+    def __init__(self, max_concurrency: int = 64, max_probes_per_second: float = None,
+                 coalescer: ProbeCoalescer = None):
+        super().__init__()
+        self.scheduler = ProbeScheduler(self.result_ready.emit, max_concurrency,
+                                        max_probes_per_second=max_probes_per_second, coalescer=coalescer)
+
+    def run(self):
+        self.scheduler.run()
+
+    def stop(self):
+        self.scheduler.stop()
+
+class ShardResultReader(QThread):
+    """Drains result records streamed back by shard processes and re-emits them as Qt signals."""
+    # node_id, ping_status, ping_response_time, port_status, port_response_time, checked_at, ping_stats
+    result_ready = Signal(str, object, float, object, float, str, object)
+
+    def __init__(self, result_queue):
+        super().__init__()
+        self.result_queue = result_queue
+        self.is_running = True
+
+    def run(self):
+        while self.is_running:
+            try:
+                records = self.result_queue.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            except (EOFError, OSError):
+                break
+            for node_id, ping_code, ping_time, port_code, port_time, checked_at, ping_stats in records:
+                self.result_ready.emit(node_id, NodeStatus(ping_code), ping_time, NodeStatus(port_code), port_time,
+                                       checked_at, ping_stats)
 
     def stop(self):
         self.is_running = False
 
 class MonitorEngine(QObject):
-    log_updated = Signal(str, str) # node_id, log_msg
+    """
+    Runs the probes and applies their results to the node tree.
+    Results from probe threads/processes are queued and applied on the GUI thread once per
+    UI_FLUSH_INTERVAL_MS; each flush emits a single results_ready batch.
+    """
+    results_ready = Signal(list, list)  # changed node_ids, node_id per new history entry
 
-    def __init__(self, node_manager):
+    def __init__(self, node_manager, mode: str = ENGINE_MODE_THREAD, max_concurrency: int = 64,
+                 shard_count: int = None, probe_budget: float = None,
+                 suppress_unreachable: bool = False, unreachable_interval_seconds: int = 300,
+                 coalesce_tolerance: float = 0.5, metrics_store=None):
         super().__init__()
         self.node_manager = node_manager
+        self.mode = mode
+        self.max_concurrency = max_concurrency
+        self.shard_count = shard_count  # None 이면 코어 수 기준
+        self.probe_budget = probe_budget  # 전체 초당 검사 수 상한 (None 이면 무제한)
+        # 상위 노드(IP 보유)가 DEAD 이면 하위 트리 검사를 억제 (0 이면 중지, 아니면 느린 주기)
+        self.suppress_unreachable = suppress_unreachable
+        self.unreachable_interval_seconds = unreachable_interval_seconds
+        # 같은 (host, 종류, port) 검사 결과를 tolerance 초 동안 공유 (thread/scheduler 모드)
+        self.coalescer = ProbeCoalescer(coalesce_tolerance)
+        self.metrics_store = metrics_store  # MetricsStore (검사 결과 영구 보관, 없으면 사용 안함)
         self.workers = {}  # node_id -> MonitorWorker
+        self._retired_workers = set()  # 종료 대기 중인 이전 MonitorWorker (join 하지 않음)
+        self._signatures = {}  # node_id -> 마지막으로 반영한 probe_signature()
+        self.scheduler_thread = None  # ENGINE_MODE_SCHEDULER 전용
+        self.shard_pool = None        # ENGINE_MODE_SHARDED 전용
+        self.shard_reader = None
+
+        # 검사 스레드 -> GUI 스레드 결과 전달 (deque append/popleft 는 lock 없이 thread-safe)
+        self._pending_results = deque()
+        self._changed_ids = {}   # 이번 flush 에서 바뀐 node_id (삽입 순서 유지)
+        self._log_batch = []     # 이번 flush 에서 history 항목이 추가된 node_id (항목마다 하나)
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setInterval(UI_FLUSH_INTERVAL_MS)
+        self._flush_timer.timeout.connect(self._flush_results)
+
+    def _enqueue_result(self, *result):
+        # 검사 스레드에서 직접 호출됨 (Qt.DirectConnection): 이벤트 큐를 거치지 않음
+        self._pending_results.append(result)
+
+    def _flush_results(self):
+        """Applies every queued result and publishes one batch to the UI."""
+        for _ in range(len(self._pending_results)):
+            self._handle_result(*self._pending_results.popleft())
+        if not self._changed_ids:
+            return
+        changed_ids, logs = list(self._changed_ids), self._log_batch
+        self._changed_ids = {}
+        self._log_batch = []
+        self.results_ready.emit(changed_ids, logs)
+
+    def _publish(self, node: NodeModel, logged: bool = True):
+        self._changed_ids[node.id] = None
+        if logged:
+            self._log_batch.append(node.id)
 
     def start_monitoring(self):
-        devices = self.node_manager.get_all_devices()
+        self._flush_timer.start()
+        devices = self.node_manager.monitored_nodes()
+        self._signatures = {device.id: device.probe_signature() for device in devices}
+        if self.mode == ENGINE_MODE_SCHEDULER:
+            if self.scheduler_thread is None:
+                self.scheduler_thread = SchedulerThread(self.max_concurrency, self.probe_budget, self.coalescer)
+                self.scheduler_thread.result_ready.connect(self._enqueue_result, Qt.DirectConnection)
+            for device in devices:
+                self.scheduler_thread.scheduler.schedule(device, spread=True)
+            self.scheduler_thread.start()
+            return
+        if self.mode == ENGINE_MODE_SHARDED:
+            if self.shard_pool is None:
+                self.shard_pool = ShardPool(self.shard_count, self.max_concurrency, probe_budget=self.probe_budget)
+                self.shard_pool.start()
+                self.shard_reader = ShardResultReader(self.shard_pool.result_queue)
+                self.shard_reader.result_ready.connect(self._enqueue_result, Qt.DirectConnection)
+                self.shard_reader.start()
+            self.shard_pool.assign(devices)
+            return
         for device in devices:
             self._start_worker(device)
 
-    def _start_worker(self, node: NodeModel):
+    def _start_worker(self, node: NodeModel, spread: bool = False):
+        if self.mode == ENGINE_MODE_SCHEDULER:
+            if self.scheduler_thread is not None:
+                self.scheduler_thread.scheduler.schedule(node, spread=spread)
+            return
+        if self.mode == ENGINE_MODE_SHARDED:
+            if self.shard_pool is not None:
+                self.shard_pool.upsert(node)
+            return
+
         if node.id in self.workers:
-            self.workers[node.id].stop()
-            self.workers[node.id].wait()
+            self._retire_worker(self.workers.pop(node.id))
             
-        worker = MonitorWorker(node)
-        worker.result_ready.connect(self._handle_result)
+        worker = MonitorWorker(node, self.coalescer,
+                               self.unreachable_interval_seconds if self.suppress_unreachable else 0)
+        worker.result_ready.connect(self._enqueue_result, Qt.DirectConnection)
         self.workers[node.id] = worker
         worker.start()
 
-    def _handle_result(self, node_id: str, ping_status: NodeStatus, ping_time: float, port_status: NodeStatus, port_time: float, checked_at: str):
+    def _retire_worker(self, worker: MonitorWorker):
+        """Stops a worker without joining it; the UI thread never waits for its sleep/timeout."""
+        worker.stop()
+        worker.result_ready.disconnect(self._enqueue_result)
+        if worker.isRunning():
+            self._retired_workers.add(worker)
+            worker.finished.connect(lambda: self._retired_workers.discard(worker))
+
+    def _handle_result(self, node_id: str, ping_status: NodeStatus, ping_time: float, port_status: NodeStatus, port_time: float, checked_at: str,
+                       ping_stats: PingStats = None):
         node = self.node_manager.get_node(node_id)
         if node:
-            node.ping_status = ping_status
-            node.port_status = port_status
-            node.ping_response_time_ms = ping_time
+            was_dead = node.ping_status == NodeStatus.DEAD
+
+            timestamp = time.mktime(time.strptime(checked_at, "%Y-%m-%d %H:%M:%S"))
+
+            if (self.suppress_unreachable and ping_status == NodeStatus.DEAD and not node.unreachable_via):
+                # 응답으로 억제가 풀린 뒤 다시 실패: 상위 노드가 아직 장애면 다시 억제
+                blocker = self._find_dead_ancestor(node)
+                if blocker is not None:
+                    node.unreachable_via = blocker.id
+                    self._suppress_node(node)
+                    node.history.append_event(timestamp, f"상위 노드 '{blocker.name}' 장애로 검사 억제")
+
+            # 상위 노드 장애 중에는 실패 결과를 "도달 불가" 로 표시
+            if node.unreachable_via and ping_status == NodeStatus.DEAD:
+                ping_status = NodeStatus.UNREACHABLE
+                if port_status == NodeStatus.DEAD:
+                    port_status = NodeStatus.UNREACHABLE
+            elif node.unreachable_via and ping_status in (NodeStatus.NORMAL, NodeStatus.WARNING):
+                # 억제 중 (또는 억제 직전에 보낸 검사) 에 응답이 왔으면 경로가 살아 있는 것: 억제 해제
+                node.unreachable_via = None
+                self._resume_node(node)
+                node.history.append_event(timestamp, "응답 확인으로 검사 재개")
+
+            self.node_manager.set_status(node, ping_status, port_status, ping_time)
             node.port_response_time_ms = port_time
             node.last_check_time = checked_at
+            node.ping_loss_percent = ping_stats.loss_percent if ping_stats else 0.0
+            node.ping_jitter_ms = ping_stats.jitter_ms if ping_stats else 0.0
             
             from src.core.logger import global_logger
             log_core_msg = f"Ping: {ping_status.name} ({ping_time:.1f}ms)"
+            if ping_stats:
+                log_core_msg = (f"Ping: {ping_status.name} ({ping_time:.1f}ms, "
+                                f"min/max {ping_stats.min_ms:.1f}/{ping_stats.max_ms:.1f}ms, "
+                                f"jitter {ping_stats.jitter_ms:.1f}ms, loss {ping_stats.loss_percent:.0f}%)")
             if node.port and node.port > 0:
                 log_core_msg += f", Port({node.port}): {port_status.name} ({port_time:.1f}ms)"
             global_logger.log_connection_status(node.name, log_core_msg)
             
-            log_entry = f"[{checked_at}] {node.name} | {log_core_msg}"
-            node.logs.append(log_entry)
-            if len(node.logs) > 1000:
-                node.logs.pop(0)
-            
-            # Emit to UI
-            self.log_updated.emit(node.id, log_entry)
+            loss_percent = ping_stats.loss_percent if ping_stats else None
+            node.history.append(timestamp, ping_status, ping_time, port_status, port_time,
+                                loss_percent, ping_stats.jitter_ms if ping_stats else 0.0)
+            if self.metrics_store is not None:
+                self.metrics_store.record(node.id, timestamp, ping_status, ping_time,
+                                          port_status, port_time, loss_percent)
+            self._publish(node)
+
+            if self.suppress_unreachable and was_dead != (ping_status == NodeStatus.DEAD):
+                self._apply_topology(node, checked_at)
+
+    def _apply_topology(self, parent: NodeModel, checked_at: str):
+        """Suppresses (parent DEAD) or resumes (parent recovered) probing of the parent's subtree."""
+        from src.core.logger import global_logger
+        parent_dead = parent.ping_status == NodeStatus.DEAD
+        changed = 0
+        timestamp = time.mktime(time.strptime(checked_at, "%Y-%m-%d %H:%M:%S"))
+
+        stack = list(parent.children)
+        while stack:
+            child = stack.pop()
+            stack.extend(child.children)
+            if not child.ip_address:
+                continue
+
+            if parent_dead:
+                if child.unreachable_via:
+                    continue  # 이미 다른 상위 노드 때문에 억제 중
+                child.unreachable_via = parent.id
+                self._suppress_node(child)
+                msg = f"상위 노드 '{parent.name}' 장애로 검사 억제"
+            else:
+                if child.unreachable_via is None:
+                    continue
+                blocker = self._find_dead_ancestor(child)
+                if blocker is not None:
+                    child.unreachable_via = blocker.id
+                    continue
+                child.unreachable_via = None
+                self._resume_node(child)
+                msg = f"상위 노드 '{parent.name}' 복구로 검사 재개"
+
+            changed += 1
+            child.history.append_event(timestamp, msg)
+            self._publish(child)
+
+        if changed:
+            action = "suppressed" if parent_dead else "resumed"
+            global_logger.log_connection_status(parent.name, f"{changed} child node(s) {action} (unreachable via parent)")
+
+    def _find_dead_ancestor(self, node: NodeModel):
+        parent = self.node_manager.get_node(node.parent_id) if node.parent_id else None
+        while parent is not None:
+            if parent.ip_address and parent.ping_status == NodeStatus.DEAD:
+                return parent
+            parent = self.node_manager.get_node(parent.parent_id) if parent.parent_id else None
+        return None
+
+    def _suppress_node(self, node: NodeModel):
+        self.node_manager.set_status(node, NodeStatus.UNREACHABLE,
+                                     NodeStatus.UNREACHABLE if node.port and node.port > 0 else None)
+        # 스레드 모드는 MonitorWorker 가 unreachable_via 를 보고 스스로 느린 주기로 전환 (0 이면 건너뜀)
+        if self.scheduler_thread is not None:
+            self.scheduler_thread.scheduler.suppress(node.id, self.unreachable_interval_seconds)
+        if self.shard_pool is not None:
+            self.shard_pool.suppress(node.id, self.unreachable_interval_seconds)
+
+    def _resume_node(self, node: NodeModel):
+        self.node_manager.set_status(
+            node,
+            NodeStatus.UNKNOWN if node.ping_status == NodeStatus.UNREACHABLE else node.ping_status,
+            NodeStatus.UNKNOWN if node.port_status == NodeStatus.UNREACHABLE else None)
+        if self.scheduler_thread is not None:
+            self.scheduler_thread.scheduler.resume(node.id)
+        if self.shard_pool is not None:
+            self.shard_pool.resume(node.id)
+
+    def coalescing_stats(self) -> dict:
+        """Probes sent vs. probes saved by sharing results between nodes with the same target."""
+        return self.coalescer.stats()
 
     def stop_monitoring(self):
+        self._flush_timer.stop()
+        if self.scheduler_thread is not None:
+            self.scheduler_thread.stop()
+            self.scheduler_thread.wait()
+            self.scheduler_thread = None
+
+        if self.shard_pool is not None:
+            self.shard_pool.stop()
+            self.shard_reader.stop()
+            self.shard_reader.wait()
+            self.shard_pool = None
+            self.shard_reader = None
+
         for worker in self.workers.values():
             worker.stop()
-        for worker in self.workers.values():
+        for worker in list(self.workers.values()) + list(self._retired_workers):
             worker.wait()
         self.workers.clear()
+        self._retired_workers.clear()
 
     def update_node_worker(self, node: NodeModel):
         """Called when a node's configuration changes"""
+        # 설정이 바뀐 노드가 더 이상 하위 노드를 막지 않으면 (IP 삭제 등) 억제 해제
+        subtree = [node]
+        for current in subtree:
+            subtree.extend(current.children)
+        self._release_unblocked(subtree)
+
+        signature = node.probe_signature()
+        if self._signatures.get(node.id) == signature:
+            # 이름/대시보드 설정 등만 바뀐 경우 스케줄은 그대로 둠
+            self._rebind_node(node)
+            return
+        self._signatures[node.id] = signature
         # Restart the worker to pick up new intervals, IPs, ports, etc.
         self._start_worker(node)
+
+    def remove_node_worker(self, node_id: str):
+        """Called when a node is deleted from the tree"""
+        self._signatures.pop(node_id, None)
+        if self.scheduler_thread is not None:
+            self.scheduler_thread.scheduler.unschedule(node_id)
+        if self.shard_pool is not None:
+            self.shard_pool.remove(node_id, lookup=self.node_manager.get_node)
+        worker = self.workers.pop(node_id, None)
+        if worker is not None:
+            self._retire_worker(worker)
+
+    def apply_config_diff(self, diff):
+        """
+        Applies a NodeManager.ConfigDiff (e.g. after import) without restarting the engine:
+        only added/updated nodes are (re)scheduled, unchanged nodes keep their schedule.
+        """
+        for node_id in diff.removed:
+            self.remove_node_worker(node_id)
+        for node in diff.added:
+            # 대량 추가 시 한꺼번에 검사하지 않도록 phase 분산
+            self._signatures[node.id] = node.probe_signature()
+            self._start_worker(node, spread=True)
+        for node in diff.updated:
+            self.update_node_worker(node)
+        for node in diff.unchanged:
+            self._rebind_node(node)
+
+        # 억제를 일으킨 상위 노드가 사라졌거나 설정이 바뀐 경우 억제 해제
+        self._release_unblocked(diff.updated + diff.unchanged)
+
+    def _release_unblocked(self, nodes):
+        """Resumes suppressed nodes that no longer have a DEAD ancestor (or points them at the current one)."""
+        for node in nodes:
+            if not node.unreachable_via:
+                continue
+            blocker = self._find_dead_ancestor(node)
+            if blocker is not None:
+                node.unreachable_via = blocker.id
+                continue
+            node.unreachable_via = None
+            self._resume_node(node)
+            node.history.append_event(time.time(), "상위 노드 설정 변경으로 검사 재개")
+            self._publish(node)
+
+    def _rebind_node(self, node: NodeModel):
+        """Points the running schedule at the current NodeModel object (import 시 객체가 새로 생성됨)."""
+        if self.scheduler_thread is not None:
+            self.scheduler_thread.scheduler.rebind(node)
+        worker = self.workers.get(node.id)
+        if worker is not None:
+            worker.node = node
@@ -1,16 +1,101 @@
+import atexit
+import gc
 import json
+import marshal
 import os
+import struct
+import threading
+import zlib
+from contextlib import contextmanager
 from typing import Optional, List
-from .models import NodeModel, NodeType
+from .models import NodeModel, NodeStatus, NodeType
+from .subtree_stats import SubtreeStats, contribution
+from src.services.dns_cache import extract_host
+
+# 가져오기 시 이전 노드에서 이어받는 런타임 상태 (설정이 아닌 값)
+RUNTIME_FIELDS = ("ping_status", "port_status", "last_check_time", "ping_response_time_ms",
+                  "port_response_time_ms", "ping_loss_percent", "ping_jitter_ms", "unreachable_via", "history")
+
+class ConfigDiff:
+    """Probe-relevant difference between two versions of the tree (모니터링 엔진 재스케줄용)"""
+    def __init__(self):
+        self.added: List[NodeModel] = []
+        self.updated: List[NodeModel] = []     # 검사 관련 설정이 바뀐 노드
+        self.unchanged: List[NodeModel] = []   # 새 객체지만 검사 설정은 동일한 노드
+        self.removed: List[str] = []
+
+SAVE_DELAY_SECONDS = 2.0     # 변경 후 저장까지 모으는 시간
+JOURNAL_COMPACT_ENTRIES = 1000  # journal 이 이만큼 쌓이면 전체 저장 후 비움
+
+# 빠른 시작용 바이너리 snapshot (<data file>.cache)
+# header: magic, version, 필드 목록 crc32, JSON 크기, JSON crc32, payload crc32
+# payload: marshal 된 노드 행 목록 (전위 순서, 값은 SNAPSHOT_FIELDS 순서)
+SNAPSHOT_MAGIC = b"PFTREE"
+SNAPSHOT_VERSION = 2
+SNAPSHOT_HEADER = struct.Struct("<6sHIQII")
+SNAPSHOT_FIELDS = tuple(key for key in NodeModel("").to_dict() if key != "children")
+# to_dict 필드가 추가/변경되면 달라짐 → 예전 snapshot 은 위치가 어긋나므로 JSON 으로 다시 읽음
+SNAPSHOT_FIELDS_CRC = zlib.crc32("\0".join(SNAPSHOT_FIELDS).encode("utf-8"))
 
 class NodeManager:
-    def __init__(self, data_file_path: str = "tree_data.json"):
+    """
+    Node tree plus its persistence (tree_data.json).
+    Changes are not written one by one: the first change schedules a save `save_delay` seconds
+    later and everything changed in the meantime goes into that one write. Saves are atomic
+    (temp file + fsync + rename), so a crash leaves either the old or the new file.
+    With `journal=True` every change is also appended to <data file>.journal right away and
+    the full file is only rewritten once JOURNAL_COMPACT_ENTRIES changes have accumulated;
+    load_data() replays the journal on top of the last full save.
+    flush() writes pending changes immediately, bulk_edit() defers saving until the block ends.
+    With `snapshot=True` a binary copy of the tree (<data file>.cache) is kept next to the JSON;
+    it is used at startup when its checksum still matches the JSON file and rebuilt otherwise.
+
+    Secondary indexes (by host, by ping status, monitored nodes, dashboard members) are kept up
+    to date on add/remove/node_changed/set_status, so consumers never rescan the whole tree.
+    `structure_version` increases whenever nodes are added, removed or edited.
+    subtree_stats() gives per-subtree status counts and worst RTT, updated along the ancestor
+    chain only (O(depth) per status change).
+    """
+    def __init__(self, data_file_path: str = "tree_data.json", save_delay: float = SAVE_DELAY_SECONDS,
+                 journal: bool = False, snapshot: bool = True):
         self.data_file_path = data_file_path
+        self.journal_path = data_file_path + ".journal"
+        self.snapshot_path = data_file_path + ".cache"
+        self.save_delay = save_delay
+        self.journal = journal
+        self.snapshot = snapshot
         self.root_nodes: List[NodeModel] = []
         self._all_nodes = {}  # id -> NodeModel for fast lookup
+        self.last_import_diff = ConfigDiff()
+
+        # 보조 index (id 로 관리, 값은 삽입 순서 유지용 dict)
+        self._by_host = {}     # host -> [node, ...] (같은 host 는 보통 몇 개뿐)
+        self._host_of = {}     # node_id -> host (index 에 등록된 값)
+        self._by_status = {status: {} for status in NodeStatus}  # ping 상태 -> {node_id: node}
+        self._status_of = {}   # node_id -> ping 상태 (index 에 등록된 값)
+        self._monitored = {}   # IP 가 설정된 노드 {node_id: node}
+        self._dashboard = None  # 대시보드 표시 노드 (트리 순서), 구조가 바뀌면 다시 계산
+        self._rollups = {}     # node_id -> SubtreeStats
+        self.structure_version = 0
+
+        self._lock = threading.RLock()       # 트리 변경 / 직렬화
+        self._write_lock = threading.Lock()  # 파일 쓰기
+        self._dirty = False
+        self._change_seq = 0  # 변경마다 증가: 저장 중에 들어온 변경을 구분
+        self._save_timer = None
+        self._bulk_depth = 0
+        self._journal_file = None
+        self._journal_entries = 0
+
         self.load_data()
+        atexit.register(self.flush)
 
     def add_node(self, node: NodeModel, parent_id: Optional[str] = None):
+        with self._lock:
+            self._add_node(node, parent_id)
+            self._changed({"op": "add", "parent": parent_id, "node": node.to_dict()})
+
+    def _add_node(self, node: NodeModel, parent_id: Optional[str]):
         if parent_id is None:
             self.root_nodes.append(node)
         else:
@@ -22,17 +107,30 @@ class NodeManager:
                 raise ValueError(f"Parent node {parent_id} not found")
         
         self._register_node_recursive(node)
-        self.save_data()
+        # 추가된 subtree 의 집계를 만들고 상위 노드들에 더함
+        stats = self._build_rollups([node])
+        for ancestor in self._ancestors(node):
+            ancestor_stats = self._rollups[ancestor.id]
+            ancestor_stats.add_counts(stats)
+            ancestor_stats.offer_worst(stats.worst_ms, stats.worst_id)
 
     def _register_node_recursive(self, node: NodeModel):
         self._all_nodes[node.id] = node
+        self._index_node(node)
         for child in node.children:
             self._register_node_recursive(child)
 
     def remove_node(self, node_id: str):
+        with self._lock:
+            if self._remove_node(node_id):
+                self._changed({"op": "remove", "id": node_id})
+
+    def _remove_node(self, node_id: str) -> bool:
         node = self.get_node(node_id)
         if not node:
-            return
+            return False
+        ancestors = self._ancestors(node)
+        stats = self._rollups[node_id]
 
         if node.parent_id is None:
             self.root_nodes = [n for n in self.root_nodes if n.id != node_id]
@@ -42,11 +140,18 @@ class NodeManager:
                 parent.children = [n for n in parent.children if n.id != node_id]
                 
         self._unregister_node_recursive(node)
-        self.save_data()
+        # 상위 노드들의 집계에서 제거된 subtree 를 뺌
+        for ancestor in ancestors:
+            ancestor_stats = self._rollups[ancestor.id]
+            ancestor_stats.add_counts(stats, -1)
+            if ancestor_stats.worst_id is not None and ancestor_stats.worst_id not in self._all_nodes:
+                ancestor_stats.recompute_worst(ancestor.id, (self._rollups[child.id] for child in ancestor.children))
+        return True
 
     def _unregister_node_recursive(self, node: NodeModel):
         if node.id in self._all_nodes:
             del self._all_nodes[node.id]
+            self._unindex_node(node)
         for child in node.children:
             self._unregister_node_recursive(child)
 
@@ -56,33 +161,440 @@ class NodeManager:
     def get_all_devices(self) -> List[NodeModel]:
         return [node for node in self._all_nodes.values() if node.type == NodeType.DEVICE]
 
+    # --- 보조 index ---
+
+    def monitored_nodes(self) -> List[NodeModel]:
+        """Nodes with an address (폴더처럼 IP 가 비어 있는 노드 제외)."""
+        return list(self._monitored.values())
+
+    def nodes_by_host(self, target: str) -> List[NodeModel]:
+        """Nodes probing the same host as `target` (IP, hostname or URL)."""
+        return list(self._by_host.get(extract_host(target), ()))
+
+    def nodes_by_status(self, status: NodeStatus) -> List[NodeModel]:
+        """Nodes whose current ping status is `status`."""
+        return list(self._by_status[status].values())
+
+    def status_counts(self) -> dict:
+        return {status: len(nodes) for status, nodes in self._by_status.items()}
+
+    def dashboard_nodes(self) -> List[NodeModel]:
+        """Nodes shown on the dashboard (send_to_dashboard), in tree order."""
+        if self._dashboard is None:
+            self._dashboard = []
+            stack = list(reversed(self.root_nodes))
+            while stack:
+                node = stack.pop()
+                if node.send_to_dashboard:
+                    self._dashboard.append(node)
+                stack.extend(reversed(node.children))
+        return self._dashboard
+
+    def subtree_stats(self, node_id: str) -> Optional[SubtreeStats]:
+        """Status counts and worst RTT of the node's subtree (폴더 행/대시보드 표시용)."""
+        return self._rollups.get(node_id)
+
+    def with_ancestors(self, node_ids) -> set:
+        """The given ids plus the ids of all their ancestors (집계가 바뀐 행 찾기)."""
+        result = set()
+        for node_id in node_ids:
+            while node_id is not None and node_id not in result:
+                result.add(node_id)
+                node = self._all_nodes.get(node_id)
+                node_id = node.parent_id if node is not None else None
+        return result
+
+    def set_status(self, node: NodeModel, ping_status: NodeStatus, port_status: Optional[NodeStatus] = None,
+                   ping_ms: Optional[float] = None):
+        """Updates a node's status, the status index and the subtree rollups (모니터링 엔진은 이 메서드로만 상태 변경)."""
+        node.ping_status = ping_status
+        if port_status is not None:
+            node.port_status = port_status
+        if ping_ms is not None:
+            node.ping_response_time_ms = ping_ms
+        previous = self._status_of.get(node.id)
+        if previous is not None and previous is not ping_status:
+            del self._by_status[previous][node.id]
+            self._by_status[ping_status][node.id] = node
+            self._status_of[node.id] = ping_status
+        self._refresh_rollup(node)
+
+    def _ancestors(self, node: NodeModel) -> List[NodeModel]:
+        ancestors = []
+        parent_id = node.parent_id
+        while parent_id is not None:
+            parent = self._all_nodes.get(parent_id)
+            if parent is None:
+                break
+            ancestors.append(parent)
+            parent_id = parent.parent_id
+        return ancestors
+
+    def _refresh_rollup(self, node: NodeModel):
+        """Applies a change of the node's own contribution (상태/RTT/주소) to it and its ancestors."""
+        stats = self._rollups.get(node.id)
+        if stats is None:
+            return
+        old_status, old_ms = stats.own_status, stats.own_ms
+        new_status, new_ms = contribution(node)
+        if old_status is new_status and old_ms == new_ms:
+            return
+        stats.set_own(new_status, new_ms)
+        for current in [node] + self._ancestors(node):
+            current_stats = self._rollups[current.id]
+            if old_status is not new_status:
+                current_stats.move(old_status, new_status)
+            if new_ms >= 0 and new_ms >= current_stats.worst_ms:
+                current_stats.offer_worst(new_ms, node.id)
+            elif current_stats.worst_id == node.id:
+                # 가장 느렸던 노드가 빨라짐: 직계 자식 집계만 보고 다시 계산
+                current_stats.recompute_worst(current.id, (self._rollups[child.id] for child in current.children))
+
+    def _build_rollups(self, roots: List[NodeModel]) -> Optional[SubtreeStats]:
+        """Computes the rollups of whole subtrees bottom-up (O(size)). Returns the last root's stats."""
+        order = []
+        stack = list(roots)
+        while stack:
+            node = stack.pop()
+            order.append(node)
+            stack.extend(node.children)
+        stats = None
+        rollups = self._rollups
+        for node in reversed(order):  # 자식이 항상 부모보다 먼저
+            stats = SubtreeStats()
+            stats.set_own(*contribution(node))
+            stats.move(None, stats.own_status)
+            if node.children:
+                children = [rollups[child.id] for child in node.children]
+                for child_stats in children:
+                    stats.add_counts(child_stats)
+                stats.recompute_worst(node.id, children)
+            elif stats.own_ms >= 0:
+                stats.worst_ms, stats.worst_id = stats.own_ms, node.id
+            rollups[node.id] = stats
+        return self._rollups.get(roots[-1].id) if roots else None
+
+    def _index_node(self, node: NodeModel):
+        host = extract_host(node.ip_address) if node.ip_address else ""
+        self._host_of[node.id] = host
+        if host:
+            same_host = self._by_host.get(host)
+            if same_host is None:
+                self._by_host[host] = [node]
+            else:
+                same_host.append(node)
+            self._monitored[node.id] = node
+        self._status_of[node.id] = node.ping_status
+        self._by_status[node.ping_status][node.id] = node
+        self._dashboard = None
+        self.structure_version += 1
+
+    def _unindex_node(self, node: NodeModel):
+        host = self._host_of.pop(node.id, "")
+        if host:
+            same_host = self._by_host[host]
+            same_host[:] = [other for other in same_host if other.id != node.id]
+            if not same_host:
+                del self._by_host[host]
+            del self._monitored[node.id]
+        status = self._status_of.pop(node.id, None)
+        if status is not None:
+            del self._by_status[status][node.id]
+        self._rollups.pop(node.id, None)
+        self._dashboard = None
+        self.structure_version += 1
+
+    def _reindex_node(self, node: NodeModel):
+        """After an in-place edit (주소가 바뀌었을 수 있음)."""
+        stats = self._rollups.get(node.id)
+        self._unindex_node(node)
+        self._index_node(node)
+        if stats is not None:
+            self._rollups[node.id] = stats
+            self._refresh_rollup(node)
+
+    def _rebuild_indexes(self):
+        self._by_host = {}
+        self._host_of = {}
+        self._by_status = {status: {} for status in NodeStatus}
+        self._status_of = {}
+        self._monitored = {}
+        for node in self._all_nodes.values():
+            self._index_node(node)
+        self._rollups = {}
+        self._build_rollups(self.root_nodes)
+
+    def node_changed(self, node: NodeModel):
+        """Records that a node's settings were edited in place (이름/주소/주기 등)."""
+        with self._lock:
+            if node.id in self._all_nodes:
+                self._reindex_node(node)
+            data = node.to_dict()
+            del data["children"]
+            self._changed({"op": "update", "node": data})
+
     def save_data(self):
-        data = [node.to_dict() for node in self.root_nodes]
+        """Schedules a save of the whole tree (flush() writes it immediately)."""
+        with self._lock:
+            self._change_seq += 1
+            self._mark_dirty()
+
+    @contextmanager
+    def bulk_edit(self):
+        """Groups many changes into a single save, written when the outermost block ends."""
+        with self._lock:
+            self._bulk_depth += 1
         try:
-            with open(self.data_file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=4, ensure_ascii=False)
-        except Exception as e:
-            print(f"Failed to save tree data: {e}")
+            yield self
+        finally:
+            with self._lock:
+                self._bulk_depth -= 1
+                done = self._bulk_depth == 0
+            if done:
+                self.flush()
+
+    def flush(self) -> bool:
+        """Writes pending changes now. Returns False if the save failed."""
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            if not self._dirty:
+                return True
+            seq = self._change_seq
+            try:
+                data = json.dumps(self._tree_dicts(), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+                rows = self._snapshot_rows() if self.snapshot else None
+            except (TypeError, ValueError) as e:
+                print(f"Failed to save tree data: {e}")
+                return False
+
+        with self._write_lock:
+            try:
+                self._write_atomic(self.data_file_path, data)
+                if rows is not None:
+                    self._write_snapshot(data, rows)
+            except OSError as e:
+                print(f"Failed to save tree data: {e}")
+                return False
+        with self._lock:
+            # 저장 중에 변경이 있었으면 dirty/journal 을 유지 (다음 저장에서 반영, replay 는 중복 적용에 안전)
+            if self._change_seq == seq:
+                self._dirty = False
+                self._truncate_journal()
+        return True
+
+    def _changed(self, entry: dict):
+        """Called (with the lock held) after every change to the tree."""
+        self._change_seq += 1
+        if self._bulk_depth:
+            # bulk 편집 중에는 끝날 때 한 번만 전체 저장
+            self._dirty = True
+            return
+        if self.journal and self._append_journal(entry) and self._journal_entries < JOURNAL_COMPACT_ENTRIES:
+            # journal 에 기록됨: 전체 파일은 나중에 한 번에 다시 씀 (flush / 종료 시)
+            self._dirty = True
+            return
+        self._mark_dirty()
+
+    def _mark_dirty(self):
+        self._dirty = True
+        if self._bulk_depth or self._save_timer is not None:
+            return
+        self._save_timer = threading.Timer(self.save_delay, self._save_timer_fired)
+        self._save_timer.daemon = True
+        self._save_timer.start()
+
+    def _save_timer_fired(self):
+        with self._lock:
+            self._save_timer = None
+        self.flush()
+
+    def _write_atomic(self, path: str, data: bytes):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def _append_journal(self, entry: dict) -> bool:
+        try:
+            if self._journal_file is None:
+                self._journal_file = open(self.journal_path, 'a', encoding='utf-8')
+            self._journal_file.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n")
+            self._journal_file.flush()
+        except OSError as e:
+            print(f"Failed to write tree journal: {e}")
+            return False
+        self._journal_entries += 1
+        return True
+
+    def _truncate_journal(self):
+        if self._journal_file is not None:
+            self._journal_file.close()
+            self._journal_file = None
+        if self._journal_entries or os.path.exists(self.journal_path):
+            try:
+                os.remove(self.journal_path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"Failed to reset tree journal: {e}")
+        self._journal_entries = 0
 
     def load_data(self):
         self.root_nodes = []
         self._all_nodes = {}
-        if not os.path.exists(self.data_file_path):
-            return
-            
+        if os.path.exists(self.data_file_path):
+            # 수만 개의 객체를 한 번에 만드는 동안 GC 가 반복 실행되지 않도록 잠시 중지
+            gc_enabled = gc.isenabled()
+            gc.disable()
+            try:
+                with open(self.data_file_path, 'rb') as f:
+                    data = f.read()
+                if not (self.snapshot and self._load_snapshot(data)):
+                    self._build_tree(json.loads(data))
+                    if self.snapshot:
+                        self._write_snapshot(data, self._snapshot_rows())
+            except Exception as e:
+                print(f"Failed to load tree data: {e}")
+            finally:
+                self._rebuild_indexes()
+                if gc_enabled:
+                    gc.enable()
+        else:
+            self._rebuild_indexes()
+        self._replay_journal()
+
+    def _build_tree(self, items: list):
+        """Builds root_nodes/_all_nodes from to_dict() items without recursion (깊은 트리 대응)."""
+        stack = [(item, None) for item in reversed(items)]
+        while stack:
+            data, parent = stack.pop()
+            node = NodeModel.from_dict(data, parent.id if parent else None, recursive=False)
+            (self.root_nodes if parent is None else parent.children).append(node)
+            self._all_nodes[node.id] = node
+            children = data.get("children")
+            if children:
+                stack.extend((child, node) for child in reversed(children))
+
+    def _tree_dicts(self) -> list:
+        """to_dict() of every root node, built without recursion."""
+        items = []
+        stack = [(node, items) for node in reversed(self.root_nodes)]
+        while stack:
+            node, siblings = stack.pop()
+            data = node.to_dict(recursive=False)
+            siblings.append(data)
+            stack.extend((child, data["children"]) for child in reversed(node.children))
+        return items
+
+    def _snapshot_rows(self) -> list:
+        """Nodes in pre-order as (parent row index or -1, *SNAPSHOT_FIELDS values)."""
+        rows = []
+        stack = [(node, -1) for node in reversed(self.root_nodes)]
+        while stack:
+            node, parent_index = stack.pop()
+            index = len(rows)
+            rows.append((parent_index, node.id, node.name, node.type.value) +
+                        tuple(getattr(node, field) for field in SNAPSHOT_FIELDS[3:]))
+            stack.extend((child, index) for child in reversed(node.children))
+        return rows
+
+    def _write_snapshot(self, json_data: bytes, rows: list):
+        payload = marshal.dumps(rows)
+        header = SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, SNAPSHOT_FIELDS_CRC, len(json_data),
+                                      zlib.crc32(json_data), zlib.crc32(payload))
         try:
-            with open(self.data_file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                for item_data in data:
-                    node = NodeModel.from_dict(item_data)
-                    self.root_nodes.append(node)
-                    self._register_node_recursive(node)
-        except Exception as e:
-            print(f"Failed to load tree data: {e}")
+            self._write_atomic(self.snapshot_path, header + payload)
+        except OSError as e:
+            print(f"Failed to write tree snapshot: {e}")
+
+    def _load_snapshot(self, json_data: bytes) -> bool:
+        """Loads the tree from the snapshot if it matches `json_data`. False if missing or stale."""
+        try:
+            with open(self.snapshot_path, 'rb') as f:
+                blob = f.read()
+        except OSError:
+            return False
+        if len(blob) < SNAPSHOT_HEADER.size:
+            return False
+        magic, version, fields_crc, json_size, json_crc, payload_crc = SNAPSHOT_HEADER.unpack_from(blob)
+        payload = memoryview(blob)[SNAPSHOT_HEADER.size:]
+        if (magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION or fields_crc != SNAPSHOT_FIELDS_CRC
+                or json_size != len(json_data)
+                or json_crc != zlib.crc32(json_data) or payload_crc != zlib.crc32(payload)):
+            return False
+        try:
+            rows = marshal.loads(payload)
+        except (EOFError, ValueError, TypeError):
+            return False
+
+        nodes = []
+        fields = SNAPSHOT_FIELDS[3:]
+        for row in rows:
+            parent = nodes[row[0]] if row[0] >= 0 else None
+            node = NodeModel(row[2], NodeType.DEVICE, row[1])
+            for field, value in zip(fields, row[4:]):
+                setattr(node, field, value)
+            if parent is not None:
+                node.parent_id = parent.id
+            (self.root_nodes if parent is None else parent.children).append(node)
+            self._all_nodes[node.id] = node
+            nodes.append(node)
+        return True
+
+    def _replay_journal(self):
+        """Applies the changes journaled since the last full save."""
+        if not os.path.exists(self.journal_path):
+            return
+        with open(self.journal_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break  # 기록 도중 종료된 마지막 줄
+                op = entry.get("op")
+                if op == "add" and entry["node"]["id"] not in self._all_nodes:
+                    parent_id = entry.get("parent")
+                    if parent_id is None or parent_id in self._all_nodes:
+                        self._add_node(NodeModel.from_dict(entry["node"], parent_id), parent_id)
+                elif op == "remove":
+                    self._remove_node(entry["id"])
+                elif op == "update":
+                    node = self.get_node(entry["node"]["id"])
+                    if node is not None:
+                        edited = NodeModel.from_dict(entry["node"], node.parent_id)
+                        for field in entry["node"]:
+                            if field not in ("id", "type"):
+                                setattr(node, field, getattr(edited, field))
+                        self._reindex_node(node)
+                self._journal_entries += 1
+        self._dirty = self._journal_entries > 0
+        if self._dirty:
+            self._mark_dirty()  # 다음 저장에서 journal 을 합쳐 비움
+
+    def _diff_and_carry_over(self, old_nodes: dict) -> ConfigDiff:
+        """새 트리와 이전 노드를 id 로 비교하고, 유지되는 노드는 런타임 상태(상태/로그)를 이어받음"""
+        diff = ConfigDiff()
+        for node_id, node in self._all_nodes.items():
+            old = old_nodes.get(node_id)
+            if old is None:
+                diff.added.append(node)
+                continue
+            for field in RUNTIME_FIELDS:
+                setattr(node, field, getattr(old, field))
+            if old.probe_signature() != node.probe_signature():
+                diff.updated.append(node)
+            else:
+                diff.unchanged.append(node)
+        diff.removed = [node_id for node_id in old_nodes if node_id not in self._all_nodes]
+        return diff
 
     def export_data(self, file_path: str) -> bool:
         """현재 트리 데이터를 지정된 파일로 내보냅니다."""
-        data = [node.to_dict() for node in self.root_nodes]
+        data = self._tree_dicts()
         try:
             with open(file_path, 'w', encoding='utf-8') as f:
                 json.dump(data, f, indent=4, ensure_ascii=False)
@@ -100,15 +612,18 @@ class NodeManager:
             with open(file_path, 'r', encoding='utf-8') as f:
                 data = json.load(f)
                 
-            self.root_nodes = []
-            self._all_nodes = {}
-            for item_data in data:
-                node = NodeModel.from_dict(item_data)
-                self.root_nodes.append(node)
-                self._register_node_recursive(node)
+            with self._lock:
+                old_nodes = self._all_nodes
+                self.root_nodes = []
+                self._all_nodes = {}
+                self._build_tree(data)
+                    
+                self.last_import_diff = self._diff_and_carry_over(old_nodes)
+                self._rebuild_indexes()  # 이어받은 상태까지 반영
+                self._dirty = True
                 
-            # 가져온 데이터를 기본 저장소에도 저장
-            self.save_data()
+            # 가져온 데이터를 기본 저장소에도 바로 저장 (이전 journal 은 비움)
+            self.flush()
             return True
         except Exception as e:
             print(f"Failed to import tree data: {e}")
@@ -0,0 +1,423 @@
+import asyncio
+import heapq
+import itertools
+import math
+import threading
+import time
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from .models import NodeModel, NodeStatus
+from src.services.dns_cache import extract_host
+from src.services.ping_service import PingService, PingStats
+from src.services.port_service import PortService
+
+# Qt 에 의존하지 않는 스케줄러 (UI 프로세스와 shard 프로세스에서 공용)
+
+def phase_offset(node_id: str, interval: float) -> float:
+    """
+    Deterministic start offset in [0, interval) derived from the node id,
+    so nodes sharing an interval are spread evenly instead of probing in lockstep.
+    """
+    return (zlib.crc32(node_id.encode("utf-8")) / 2**32) * interval
+
+class ProbeRateMeter:
+    """Counts probes per wall-clock second over a sliding window (for load flatness checks)."""
+    def __init__(self, window_seconds: int = 120):
+        self._buckets = deque(maxlen=window_seconds)  # [second, count]
+        self._lock = threading.Lock()
+
+    def record(self, count: int = 1, now: float = None):
+        second = int(time.monotonic() if now is None else now)
+        with self._lock:
+            if self._buckets and self._buckets[-1][0] == second:
+                self._buckets[-1][1] += count
+                return
+            # 검사가 없던 초도 0 으로 채워야 분산이 정확함
+            if self._buckets:
+                for empty in range(self._buckets[-1][0] + 1, second):
+                    self._buckets.append([empty, 0])
+            self._buckets.append([second, count])
+
+    def stats(self):
+        """Returns (mean, variance) of probes/second over the completed seconds in the window."""
+        with self._lock:
+            counts = [count for _, count in list(self._buckets)[:-1]]
+        if not counts:
+            return 0.0, 0.0
+        mean = sum(counts) / len(counts)
+        return mean, sum((c - mean) ** 2 for c in counts) / len(counts)
+class AdaptiveIntervalPolicy:
+    """
+    Per-node adaptive probe interval (for nodes with adaptive_interval enabled).
+    Every `stable_after` identical results the interval grows by `backoff`, up to
+    max_check_interval_seconds; a status change or a latency jump snaps it back
+    to check_interval_seconds.
+    """
+    def __init__(self, backoff: float = 1.5, stable_after: int = 3, latency_jump: float = 1.5):
+        self.backoff = backoff
+        self.stable_after = stable_after
+        self.latency_jump = latency_jump  # 평균 대비 이 배수 이상이면 "지연 상승"
+        self._state = {}  # node_id -> [interval, streak, last_status, latency_ewma]
+
+    def interval_for(self, node: NodeModel) -> float:
+        base = max(1, node.check_interval_seconds)
+        if not node.adaptive_interval:
+            return base
+        state = self._state.get(node.id)
+        return state[0] if state else base
+
+    def observe(self, node: NodeModel, status, latency_ms: float):
+        if not node.adaptive_interval:
+            return
+        base = max(1, node.check_interval_seconds)
+        ceiling = max(base, node.max_check_interval_seconds)
+
+        state = self._state.get(node.id)
+        if state is None:
+            self._state[node.id] = [base, 0, status, latency_ms]
+            return
+
+        interval, streak, last_status, latency_ewma = state
+        latency_rising = latency_ms > 0 and latency_ewma > 0 and latency_ms > latency_ewma * self.latency_jump + 1.0
+        if status != last_status or latency_rising:
+            interval, streak = base, 0
+        else:
+            streak += 1
+            if streak >= self.stable_after:
+                interval, streak = interval * self.backoff, 0
+
+        if latency_ms > 0:
+            latency_ewma = latency_ms if latency_ewma <= 0 else latency_ewma * 0.8 + latency_ms * 0.2
+        state[:] = [min(max(interval, base), ceiling), streak, status, latency_ewma]
+
+    def forget(self, node_id: str):
+        self._state.pop(node_id, None)
+
+def ping_key(node: NodeModel):
+    if node.ping_count > 1:
+        return ("icmp", extract_host(node.ip_address), node.ping_count, node.ping_spacing_ms)
+    return ("icmp", extract_host(node.ip_address))
+
+def port_key(node: NodeModel):
+    return ("tcp", extract_host(node.ip_address), node.port)
+
+class ProbeCoalescer:
+    """
+    Deduplicates probes by (host, probe type, port).
+    A result whose probe started less than `tolerance` seconds ago is reused instead of
+    probing again, and duplicate keys within one batch are probed once. `saved` counts the
+    probes avoided. Keep tolerance below the shortest check interval so a node never gets
+    its own previous result back.
+    """
+    def __init__(self, tolerance: float = 0.5):
+        self.tolerance = tolerance
+        self._results = {}  # key -> (monotonic, result)
+        self._lock = threading.Lock()
+        self._last_prune = time.monotonic()
+        self.sent = 0
+        self.saved = 0
+
+    def plan(self, keys, now: float = None):
+        """
+        Splits keys into fresh cached results and the unique keys that still need a probe.
+        Returns (results: {key: result}, pending: [key]).
+        """
+        now = time.monotonic() if now is None else now
+        results = {}
+        pending = {}
+        with self._lock:
+            for key in keys:
+                if key in results or key in pending:
+                    self.saved += 1
+                    continue
+                entry = self._results.get(key)
+                if entry is not None and now - entry[0] < self.tolerance:
+                    results[key] = entry[1]
+                    self.saved += 1
+                else:
+                    pending[key] = None
+            self.sent += len(pending)
+        return results, list(pending)
+
+    def record(self, results: dict, started: float = None):
+        """Stores fresh results, stamped with the time their probes started."""
+        now = time.monotonic() if started is None else started
+        with self._lock:
+            for key, result in results.items():
+                self._results[key] = (now, result)
+            # 오래된 결과 정리
+            if now - self._last_prune > 60:
+                self._last_prune = now
+                self._results = {key: entry for key, entry in self._results.items()
+                                 if now - entry[0] < self.tolerance}
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"sent": self.sent, "saved": self.saved}
+
+class ProbeScheduler:
+    """
+    Single event-loop probe scheduler.
+    Keeps every node's next due time in a heap and runs probes with bounded concurrency,
+    so thousands of nodes share one loop instead of one OS thread each.
+    Qt-independent: results are delivered through the on_result callback.
+    """
+    def __init__(self, on_result, max_concurrency: int = 64, batch_window: float = 0.05,
+                 max_sockets: int = 1024, max_probes_per_second: float = None,
+                 coalescer: ProbeCoalescer = None):
+        self.on_result = on_result
+        self.max_concurrency = max_concurrency
+        self.max_sockets = max_sockets  # 동시에 열어둘 TCP 소켓 상한 (port 검사)
+        self.batch_window = batch_window  # 이 시간 안에 도래하는 노드는 한 tick 으로 묶음
+
+        self._heap = []          # (due_monotonic, seq, node_id, generation)
+        self._nodes = {}         # node_id -> NodeModel
+        self._generations = {}   # node_id -> generation of its live heap entry
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._epoch = time.monotonic()  # phase 계산 기준 시각
+        self.rate_meter = ProbeRateMeter()
+        # 같은 대상 (host, 종류, port) 을 가리키는 노드들은 한 번만 검사하고 결과를 공유
+        self.coalescer = coalescer or ProbeCoalescer()
+
+        # 적응형 주기 + 전역 예산 (초당 검사 수 상한, None 이면 무제한)
+        self.policy = AdaptiveIntervalPolicy()
+        self.max_probes_per_second = max_probes_per_second
+        self._rates = {}          # node_id -> 계획된 초당 검사 수 (1 / interval)
+        self._planned_rate = 0.0
+
+        # 상위 노드 장애로 억제된 노드: node_id -> 느린 검사 주기 (0 이면 검사 중지)
+        self._suppressed = {}
+
+        self._loop = None
+        self._wakeup = None
+        self._stop_requested = False
+
+    def schedule(self, node: NodeModel, delay: float = 0.0, spread: bool = False):
+        """
+        Adds or reschedules a node. Thread-safe and non-blocking.
+        With spread=True the first probe lands on the node's phase slot instead of after delay.
+        """
+        with self._lock:
+            self.policy.forget(node.id)  # 설정이 바뀌었을 수 있으므로 적응형 상태 초기화
+            now = time.monotonic()
+            due = self._next_slot(node, now - 1e-9) if spread else now + delay
+            generation = next(self._seq)
+            self._generations[node.id] = generation
+            self._nodes[node.id] = node
+            heapq.heappush(self._heap, (due, generation, node.id, generation))
+            self._compact_heap()
+        self._notify()
+
+    def rebind(self, node: NodeModel):
+        """Swaps in a new object for an already scheduled node without touching its schedule."""
+        with self._lock:
+            if node.id in self._nodes:
+                self._nodes[node.id] = node
+
+    def _compact_heap(self):
+        # 재스케줄/삭제로 남은 stale 항목이 많아지면 heap 을 재구성 (lock 보유 상태에서 호출)
+        if len(self._heap) <= 2 * len(self._generations) + 1024:
+            return
+        self._heap = [entry for entry in self._heap if self._generations.get(entry[2]) == entry[3]]
+        heapq.heapify(self._heap)
+
+    def _next_slot(self, node: NodeModel, after: float) -> float:
+        """
+        Next due time strictly after `after` on the node's fixed grid
+        (epoch + phase + k * interval). Staying on the grid keeps probes from drifting.
+        """
+        interval = self.policy.interval_for(node)
+        if self._suppressed.get(node.id):
+            interval = max(interval, self._suppressed[node.id])
+        self._set_rate(node.id, 1.0 / interval)
+        interval *= self._budget_scale()
+        # phase 는 검사 대상 기준: 같은 host 를 가리키는 노드들이 같은 batch 에 모여 coalescing 됨
+        phase = self._epoch + phase_offset(ping_key(node)[1], interval)
+        k = math.floor((after - phase) / interval) + 1
+        return phase + k * interval
+
+    def _set_rate(self, node_id: str, rate: float):
+        self._planned_rate += rate - self._rates.get(node_id, 0.0)
+        self._rates[node_id] = rate
+
+    def _budget_scale(self) -> float:
+        """Factor by which every interval is stretched to keep the planned rate within budget."""
+        if not self.max_probes_per_second or self._planned_rate <= self.max_probes_per_second:
+            return 1.0
+        return self._planned_rate / self.max_probes_per_second
+
+    def planned_probe_rate(self) -> float:
+        """Planned probes/second before the budget is applied."""
+        with self._lock:
+            return self._planned_rate
+
+    def suppress(self, node_id: str, interval: float = 0):
+        """Stops probing a node (interval 0) or slows it to `interval` seconds."""
+        with self._lock:
+            self._suppressed[node_id] = interval
+            if not interval:
+                self._set_rate(node_id, 0.0)
+
+    def resume(self, node_id: str):
+        """Lifts a suppression and probes the node right away."""
+        with self._lock:
+            was_suppressed = self._suppressed.pop(node_id, None) is not None
+            node = self._nodes.get(node_id)
+        if was_suppressed and node is not None:
+            self.schedule(node)
+
+    def probe_rate_stats(self):
+        """(mean, variance) of dispatched probes per second over the last couple of minutes."""
+        return self.rate_meter.stats()
+
+    def unschedule(self, node_id: str):
+        """Removes a node. Its stale heap entry is skipped lazily."""
+        with self._lock:
+            self._nodes.pop(node_id, None)
+            self._generations.pop(node_id, None)
+            self._set_rate(node_id, 0.0)
+            del self._rates[node_id]
+            self._suppressed.pop(node_id, None)
+            self.policy.forget(node_id)
+            self._compact_heap()
+
+    def scheduled_count(self) -> int:
+        with self._lock:
+            return len(self._nodes)
+
+    def run(self):
+        """Runs the event loop on the calling thread until stop() is called."""
+        self._stop_requested = False
+        asyncio.run(self._main())
+
+    def stop(self):
+        self._stop_requested = True
+        self._notify()
+
+    def _notify(self):
+        loop = self._loop
+        if loop is None:
+            return
+        try:
+            loop.call_soon_threadsafe(self._wakeup.set)
+        except RuntimeError:
+            # 루프가 이미 종료된 경우
+            pass
+
+    async def _main(self):
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="probe")
+        tasks = set()
+        try:
+            while not self._stop_requested:
+                self._wakeup.clear()
+                due, timeout = self._pop_due()
+                if due:
+                    self.rate_meter.record(len(due))
+                    # 같은 tick 에 도래한 노드들은 하나의 ICMP sweep 으로 처리
+                    task = asyncio.create_task(self._run_batch(due, semaphore, executor))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._loop = None
+            for task in list(tasks):
+                task.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _pop_due(self):
+        now = time.monotonic()
+        due = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now + self.batch_window:
+                entry_due, _, node_id, generation = heapq.heappop(self._heap)
+                if self._generations.get(node_id) != generation:
+                    continue  # 재스케줄/삭제된 항목
+                node = self._nodes.get(node_id)
+                # IP 주소가 없으면 검사 제외 (단순 폴더 역할), 설정 변경 시 다시 schedule 됨
+                if node is None or not node.ip_address:
+                    continue
+                # 검사 중지된 노드는 resume() 에서 다시 스케줄됨
+                if self._suppressed.get(node_id) == 0:
+                    continue
+                due.append((node, generation, entry_due))
+            timeout = max(0.0, self._heap[0][0] - now) if self._heap else None
+        return due, timeout
+
+    async def _run_batch(self, batch, semaphore: asyncio.Semaphore, executor):
+        loop = asyncio.get_running_loop()
+        try:
+            checked_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            started = time.monotonic()
+            # 검사 도중 UI 에서 노드 설정이 바뀔 수 있으므로 key 는 계획 시점에 한 번만 계산
+            planned = [(node, ping_key(node), port_key(node) if node.port and node.port > 0 else None,
+                        node.ping_count > 1)
+                       for node, _, _ in batch]
+            ping_results, ping_pending = self.coalescer.plan([keys[1] for keys in planned], started)
+            port_results, port_pending = self.coalescer.plan(
+                [keys[2] for keys in planned if keys[2] is not None], started)
+
+            # ping sweep, 다중 ping(burst), non-blocking port 검사를 동시에 진행 (coalescing 후 남은 대상만)
+            sweep_keys = [key for key in ping_pending if len(key) == 2]
+            burst_keys = [key for key in ping_pending if len(key) > 2]
+            async with semaphore:
+                ping_future = loop.run_in_executor(
+                    executor, PingService.check_ping_many, [host for _, host in sweep_keys])
+                port_future = loop.run_in_executor(
+                    executor, PortService.check_ports_many,
+                    [(host, port) for _, host, port in port_pending], 2.0, self.max_sockets)
+                burst_futures = [loop.run_in_executor(executor, PingService.check_ping_burst, host, count, spacing)
+                                 for _, host, count, spacing in burst_keys]
+                swept, connected, *bursts = await asyncio.gather(ping_future, port_future, *burst_futures)
+
+            fresh = {key: PingStats.single(*swept.get(key[1], (False, 0.0))) for key in sweep_keys}
+            fresh.update(zip(burst_keys, bursts))
+            fresh.update({key: connected.get(key[1:], (False, 0.0)) for key in port_pending})
+            self.coalescer.record(fresh, started)
+            ping_results.update(fresh)
+            port_results.update(fresh)
+
+            for node, ping_k, port_k, burst in planned:
+                try:
+                    stats = ping_results[ping_k]
+                    ping_status = node.classify_ping(stats.loss_percent, stats.avg_ms)
+                    ping_time = stats.avg_ms
+
+                    port_status = NodeStatus.UNKNOWN
+                    port_time = 0.0
+                    if port_k is not None:
+                        port_success, port_time = port_results[port_k]
+                        port_status = NodeStatus.NORMAL if port_success else NodeStatus.DEAD
+
+                    self.policy.observe(node, (ping_status, port_status), ping_time)
+                    self.on_result(node.id, ping_status, ping_time, port_status, port_time, checked_at,
+                                   stats if burst else None)
+                except Exception as e:
+                    # 한 노드의 오류로 batch 의 다른 결과를 버리지 않음
+                    print(f"Error checking {node.name}: {e}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Error checking {len(batch)} node(s): {e}")
+        finally:
+            for node, generation, due in batch:
+                self._reschedule(node, generation, due)
+
+    def _reschedule(self, node: NodeModel, generation: int, previous_due: float):
+        with self._lock:
+            # 검사 도중 설정이 바뀌었으면 이미 새 항목이 들어가 있음
+            if self._generations.get(node.id) != generation:
+                return
+            # 검사 소요 시간과 무관하게 고정 grid 의 다음 slot 으로 (밀린 slot 은 건너뜀)
+            due = self._next_slot(node, max(previous_due, time.monotonic()))
+            heapq.heappush(self._heap, (due, next(self._seq), node.id, generation))
+        # 메인 루프가 더 늦은 기한으로 대기 중일 수 있으므로 깨움
+        self._wakeup.set()
@@ -0,0 +1,203 @@
+import multiprocessing
+import os
+import queue
+import threading
+from typing import Callable, Iterable, List, Optional
+from .models import NodeModel
+from .probe_scheduler import ProbeScheduler
+
+SHARD_FLUSH_INTERVAL = 0.1  # shard -> UI 결과 전송 주기 (초)
+
+def _shard_main(shard_index: int, command_queue, result_queue, max_concurrency: int,
+                max_probes_per_second: Optional[float] = None):
+    """
+    Shard process entry point.
+    Runs its own ProbeScheduler and streams compact result records
+    (node_id, ping_status, ping_ms, port_status, port_ms, checked_at, ping_stats) back in batches.
+    """
+    buffer = []
+    buffer_lock = threading.Lock()
+
+    def on_result(node_id, ping_status, ping_time, port_status, port_time, checked_at, ping_stats):
+        with buffer_lock:
+            buffer.append((node_id, ping_status.value, ping_time, port_status.value, port_time, checked_at, ping_stats))
+
+    scheduler = ProbeScheduler(on_result, max_concurrency, max_probes_per_second=max_probes_per_second)
+    loop_thread = threading.Thread(target=scheduler.run, name=f"shard-{shard_index}", daemon=True)
+    loop_thread.start()
+
+    running = True
+    while running:
+        try:
+            command, payload = command_queue.get(timeout=SHARD_FLUSH_INTERVAL)
+        except queue.Empty:
+            command, payload = None, None
+        except (EOFError, OSError):
+            break  # UI 프로세스 종료
+
+        if command == "upsert":
+            for config, spread, suppressed_interval in payload:
+                if suppressed_interval is not None:
+                    # 다른 shard 에서 옮겨온 억제 노드: 첫 검사 시각부터 느린 주기 적용
+                    scheduler.suppress(config["id"], suppressed_interval)
+                scheduler.schedule(NodeModel.from_dict(config), spread=spread)
+        elif command == "remove":
+            for node_id in payload:
+                scheduler.unschedule(node_id)
+        elif command == "suppress":
+            for node_id, interval in payload:
+                scheduler.suppress(node_id, interval)
+        elif command == "resume":
+            for node_id in payload:
+                scheduler.resume(node_id)
+        elif command == "stop":
+            running = False
+
+        with buffer_lock:
+            records = buffer[:]
+            buffer.clear()
+        if records:
+            result_queue.put(records)
+
+    scheduler.stop()
+    loop_thread.join(timeout=2)
+
+class ShardPool:
+    """
+    Partitions monitored nodes across N probe processes (one per core by default).
+    New nodes go to the least loaded shard; removals trigger a rebalance once the
+    spread between the largest and smallest shard exceeds the tolerance.
+    """
+    def __init__(self, shard_count: Optional[int] = None, max_concurrency: int = 64,
+                 rebalance_tolerance: float = 0.1, probe_budget: Optional[float] = None):
+        # UI 프로세스용으로 코어 하나를 남김
+        self.shard_count = shard_count or max(1, (os.cpu_count() or 2) - 1)
+        self.max_concurrency = max_concurrency
+        self.rebalance_tolerance = rebalance_tolerance
+        # 전역 예산은 shard 수로 균등 분할 (노드도 균등 분배되므로)
+        self.shard_budget = probe_budget / self.shard_count if probe_budget else None
+
+        # Qt 스레드가 떠 있는 프로세스에서 fork 는 위험하므로 spawn 사용
+        self._context = multiprocessing.get_context("spawn")
+        self.result_queue = self._context.Queue()
+        self._command_queues = []
+        self._processes = []
+
+        self._assignment = {}  # node_id -> shard index
+        self._members = [set() for _ in range(self.shard_count)]
+        self._suppressed = {}  # node_id -> 억제 주기, upsert 때 함께 보냄 (shard 이동 시에도 유지)
+
+    def start(self):
+        for index in range(self.shard_count):
+            command_queue = self._context.Queue()
+            process = self._context.Process(
+                target=_shard_main,
+                args=(index, command_queue, self.result_queue, self.max_concurrency, self.shard_budget),
+                name=f"PingForest-shard-{index}",
+                daemon=True,
+            )
+            process.start()
+            self._command_queues.append(command_queue)
+            self._processes.append(process)
+
+    def stop(self, timeout: float = 3.0):
+        for command_queue in self._command_queues:
+            try:
+                command_queue.put(("stop", None))
+            except (ValueError, OSError):
+                pass
+        for process in self._processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+        self._command_queues.clear()
+        self._processes.clear()
+        self._assignment.clear()
+        self._members = [set() for _ in range(self.shard_count)]
+        self._suppressed.clear()
+
+    def shard_sizes(self) -> List[int]:
+        return [len(members) for members in self._members]
+
+    def assign(self, nodes: Iterable[NodeModel], spread: bool = True):
+        """Bulk-assigns nodes (used on start). Configs are sent as one command per shard."""
+        batches = [[] for _ in range(self.shard_count)]
+        for node in nodes:
+            if not node.ip_address:
+                continue
+            shard = self._assignment.get(node.id)
+            if shard is None:
+                shard = self._least_loaded()
+                self._place(node.id, shard)
+            batches[shard].append(self._upsert_entry(node, spread))
+        for shard, batch in enumerate(batches):
+            if batch:
+                self._send(shard, "upsert", batch)
+
+    def upsert(self, node: NodeModel):
+        """Adds or updates one node; nodes without an IP are dropped from their shard."""
+        if not node.ip_address:
+            self.remove(node.id)
+            return
+        shard = self._assignment.get(node.id)
+        if shard is None:
+            shard = self._least_loaded()
+            self._place(node.id, shard)
+        self._send(shard, "upsert", [self._upsert_entry(node, False)])
+
+    def remove(self, node_id: str, lookup: Optional[Callable[[str], Optional[NodeModel]]] = None):
+        shard = self._assignment.pop(node_id, None)
+        if shard is None:
+            return
+        self._members[shard].discard(node_id)
+        self._suppressed.pop(node_id, None)
+        self._send(shard, "remove", [node_id])
+        if lookup is not None:
+            self._rebalance(lookup)
+
+    def suppress(self, node_id: str, interval: float = 0):
+        shard = self._assignment.get(node_id)
+        if shard is not None:
+            self._suppressed[node_id] = interval
+            self._send(shard, "suppress", [(node_id, interval)])
+
+    def resume(self, node_id: str):
+        shard = self._assignment.get(node_id)
+        if shard is not None:
+            self._suppressed.pop(node_id, None)
+            self._send(shard, "resume", [node_id])
+
+    def _upsert_entry(self, node: NodeModel, spread: bool):
+        """(probe config, spread, suppression interval or None) of an upsert command."""
+        return node.probe_config(), spread, self._suppressed.get(node.id)
+
+    def _rebalance(self, lookup: Callable[[str], Optional[NodeModel]]):
+        """Moves nodes from the largest to the smallest shard until they are within tolerance."""
+        moves = {}  # (from, to) -> [node_id]
+        while True:
+            sizes = self.shard_sizes()
+            largest = max(range(self.shard_count), key=sizes.__getitem__)
+            smallest = min(range(self.shard_count), key=sizes.__getitem__)
+            allowed = max(1, int(self.rebalance_tolerance * sum(sizes) / self.shard_count))
+            if sizes[largest] - sizes[smallest] <= allowed:
+                break
+            node_id = next(iter(self._members[largest]))
+            self._members[largest].discard(node_id)
+            self._place(node_id, smallest)
+            moves.setdefault((largest, smallest), []).append(node_id)
+
+        for (source, target), node_ids in moves.items():
+            self._send(source, "remove", node_ids)
+            nodes = [lookup(node_id) for node_id in node_ids]
+            self._send(target, "upsert", [self._upsert_entry(node, True) for node in nodes if node])
+
+    def _least_loaded(self) -> int:
+        return min(range(self.shard_count), key=lambda i: len(self._members[i]))
+
+    def _place(self, node_id: str, shard: int):
+        self._assignment[node_id] = shard
+        self._members[shard].add(node_id)
+
+    def _send(self, shard: int, command: str, payload):
+        if shard < len(self._command_queues):
+            self._command_queues[shard].put((command, payload))
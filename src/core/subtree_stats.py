@@ -0,0 +1,76 @@
+from typing import Iterable, Optional
+from .models import NodeModel, NodeStatus
+
+_STATUSES = list(NodeStatus)
+_STATUS_INDEX = {status: index for index, status in enumerate(_STATUSES)}
+_ALIVE = (NodeStatus.NORMAL, NodeStatus.WARNING)
+# 폴더에 대표로 표시할 상태 우선순위 (앞쪽이 더 심각)
+_SEVERITY = (NodeStatus.DEAD, NodeStatus.UNREACHABLE, NodeStatus.WARNING, NodeStatus.NORMAL, NodeStatus.UNKNOWN)
+
+def contribution(node: NodeModel):
+    """(status, rtt) a node adds to its subtree: status None without an address, rtt -1 when not answering."""
+    if not node.ip_address:
+        return None, -1.0
+    rtt = node.ping_response_time_ms if node.ping_status in _ALIVE else -1.0
+    return node.ping_status, rtt
+
+class SubtreeStats:
+    """
+    Aggregate health of a node's subtree (the node itself included when it has an address).
+    Kept up to date by NodeManager: a status change only touches the node's ancestors.
+    """
+    __slots__ = ("counts", "worst_ms", "worst_id", "own_status", "own_ms")
+
+    def __init__(self):
+        self.counts = [0] * len(_STATUSES)  # NodeStatus 순서별 노드 수
+        self.worst_ms = -1.0                # 응답한 노드 중 가장 느린 RTT, 없으면 -1
+        self.worst_id = None                # worst_ms 를 가진 노드
+        self.own_status = None              # 이 노드 자신의 기여 (contribution)
+        self.own_ms = -1.0
+
+    def count(self, status: NodeStatus) -> int:
+        return self.counts[_STATUS_INDEX[status]]
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts)
+
+    @property
+    def problems(self) -> int:
+        """DEAD + WARNING + UNREACHABLE nodes."""
+        return (self.count(NodeStatus.DEAD) + self.count(NodeStatus.WARNING)
+                + self.count(NodeStatus.UNREACHABLE))
+
+    def worst_status(self) -> Optional[NodeStatus]:
+        """Most severe status present in the subtree, None if it has no monitored node."""
+        for status in _SEVERITY:
+            if self.count(status):
+                return status
+        return None
+
+    def set_own(self, status: Optional[NodeStatus], rtt: float):
+        self.own_status = status
+        self.own_ms = rtt
+
+    def add_counts(self, other: "SubtreeStats", sign: int = 1):
+        for index, value in enumerate(other.counts):
+            self.counts[index] += sign * value
+
+    def move(self, old: Optional[NodeStatus], new: Optional[NodeStatus]):
+        if old is not None:
+            self.counts[_STATUS_INDEX[old]] -= 1
+        if new is not None:
+            self.counts[_STATUS_INDEX[new]] += 1
+
+    def offer_worst(self, rtt: float, node_id: str):
+        if rtt >= 0 and rtt >= self.worst_ms:
+            self.worst_ms = rtt
+            self.worst_id = node_id
+
+    def recompute_worst(self, node_id: str, children: Iterable["SubtreeStats"]):
+        """Recomputes worst_ms from the own rtt and the direct children's (stats) only."""
+        self.worst_ms, self.worst_id = (self.own_ms, node_id) if self.own_ms >= 0 else (-1.0, None)
+        for child in children:
+            if child.worst_ms > self.worst_ms:
+                self.worst_ms = child.worst_ms
+                self.worst_id = child.worst_id
@@ -0,0 +1,125 @@
+import ipaddress
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Optional
+from urllib.parse import urlparse
+
+@lru_cache(maxsize=8192)
+def extract_host(target: str) -> str:
+    """URL 형태 (http://, https://) 라면 호스트명만 추출 (결과는 캐시됨)"""
+    if target.startswith("http://") or target.startswith("https://"):
+        parsed_url = urlparse(target)
+        target = parsed_url.hostname or target
+        # 포트 번호가 포함되어있는 경우 제거
+        if ":" in target:
+            target = target.split(":")[0]
+    return target
+
+class ResolverCache:
+    """
+    Shared hostname -> IPv4 address cache.
+    Positive answers live for `ttl`, failures for `negative_ttl`. With stale_while_revalidate,
+    an expired answer is still served for up to `stale_ttl` while a background lookup refreshes it,
+    so a slow resolver never sits on the probe path once a host has been seen.
+    """
+    def __init__(self, ttl: float = 300.0, negative_ttl: float = 30.0, stale_ttl: float = 3600.0,
+                 stale_while_revalidate: bool = True, max_workers: int = 4):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.stale_ttl = stale_ttl
+        self.stale_while_revalidate = stale_while_revalidate
+
+        self._entries = {}      # host -> (address or None, expires_at, stale_until)
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="dns")
+
+        self.hits = 0
+        self.negative_hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+
+    def resolve(self, host: str) -> Optional[str]:
+        """Returns the IPv4 address for host, or None if it does not resolve."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(host)
+            if entry is not None:
+                address, expires_at, stale_until = entry
+                if now < expires_at:
+                    if address is None:
+                        self.negative_hits += 1
+                    else:
+                        self.hits += 1
+                    return address
+                if self.stale_while_revalidate and address is not None and now < stale_until:
+                    self.stale_hits += 1
+                    if host not in self._refreshing:
+                        self._refreshing.add(host)
+                        self._executor.submit(self._refresh, host)
+                    return address
+            self.misses += 1
+        return self._lookup(host)
+
+    def _refresh(self, host: str):
+        try:
+            with self._lock:
+                self.refreshes += 1
+            self._lookup(host, keep_stale=True)
+        finally:
+            with self._lock:
+                self._refreshing.discard(host)
+
+    def _lookup(self, host: str, keep_stale: bool = False) -> Optional[str]:
+        try:
+            ipaddress.IPv4Address(host)
+            # IP 리터럴은 만료되지 않음
+            with self._lock:
+                self._entries[host] = (host, float("inf"), float("inf"))
+            return host
+        except ValueError:
+            pass
+
+        try:
+            address = socket.gethostbyname(host)
+        except (socket.gaierror, socket.herror, UnicodeError, OSError):
+            address = None
+
+        now = time.monotonic()
+        with self._lock:
+            previous = self._entries.get(host)
+            if address is None and keep_stale and previous is not None and previous[0] is not None:
+                # 백그라운드 갱신 실패: 기존 값은 stale 기간 동안 유지
+                return previous[0]
+            if address is None:
+                self._entries[host] = (None, now + self.negative_ttl, now + self.negative_ttl)
+            else:
+                self._entries[host] = (address, now + self.ttl, now + self.ttl + self.stale_ttl)
+        return address
+
+    def invalidate(self, host: str = None):
+        with self._lock:
+            if host is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(host, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.negative_hits + self.stale_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "negative_hits": self.negative_hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "refreshes": self.refreshes,
+                "hit_ratio": (lookups - self.misses) / lookups if lookups else 0.0,
+            }
+
+# Singleton-like instance shared by PingService and PortService
+resolver_cache = ResolverCache()
@@ -1,23 +1,408 @@
 import subprocess
 import platform
 import re
-from typing import Tuple
-from urllib.parse import urlparse
+import os
+import errno
+import select
+import socket
+import struct
+import itertools
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional, Tuple
+from .dns_cache import extract_host, resolver_cache
+
+ICMP_ECHO_REPLY = 0
+ICMP_ECHO_REQUEST = 8
+ICMP_PAYLOAD_SIZE = 56
+SWEEP_CHUNK_SIZE = 32768       # 한 번의 sweep 에서 사용하는 sequence 번호 수 (16bit 공간의 절반)
+SWEEP_RCVBUF_BYTES = 4 * 1024 * 1024
+
+# ICMP 소켓 모드 (in-process ping)
+ICMP_MODE_DGRAM = "dgram"  # Linux 비특권 ICMP 소켓 (net.ipv4.ping_group_range)
+ICMP_MODE_RAW = "raw"      # raw 소켓 (root / CAP_NET_RAW / Windows 관리자)
+ICMP_MODE_NONE = "none"    # 사용 불가 -> ping 프로세스 fallback
+
+def icmp_checksum(data: bytes) -> int:
+    if len(data) % 2:
+        data += b"\x00"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+def build_echo_request(identifier: int, sequence: int) -> bytes:
+    payload = struct.pack("!Q", time.perf_counter_ns()).ljust(ICMP_PAYLOAD_SIZE, b"\x00")
+    header = struct.pack("!BBHHH", ICMP_ECHO_REQUEST, 0, 0, identifier, sequence)
+    checksum = icmp_checksum(header + payload)
+    return struct.pack("!BBHHH", ICMP_ECHO_REQUEST, 0, checksum, identifier, sequence) + payload
+
+def parse_echo_reply(packet: bytes) -> Optional[Tuple[int, int]]:
+    """Returns (identifier, sequence) for an echo reply, None for anything else."""
+    # raw 소켓 (및 macOS 의 DGRAM 소켓) 은 IPv4 헤더 포함: version nibble 로 판별 (ICMP type 은 0x4X 가 아님)
+    offset = (packet[0] & 0x0F) * 4 if packet and packet[0] >> 4 == 4 else 0
+    if len(packet) < offset + 8:
+        return None
+    icmp_type, _, _, identifier, sequence = struct.unpack("!BBHHH", packet[offset:offset + 8])
+    if icmp_type != ICMP_ECHO_REPLY:
+        return None
+    return identifier, sequence
+
+class PingStats:
+    """
+    Streaming statistics for a burst of echo requests, updated one reply at a time.
+    Jitter is the running mean of the absolute difference between consecutive RTTs.
+    """
+    def __init__(self):
+        self.sent = 0
+        self.received = 0
+        self.min_ms = 0.0
+        self.max_ms = 0.0
+        self.avg_ms = 0.0
+        self.jitter_ms = 0.0
+        self._last_ms: Optional[float] = None
+
+    @classmethod
+    def single(cls, success: bool, rtt_ms: float) -> "PingStats":
+        stats = cls()
+        stats.sent = 1
+        if success:
+            stats.add_reply(rtt_ms)
+        return stats
+
+    def add_reply(self, rtt_ms: float):
+        self.received += 1
+        if self.received == 1:
+            self.min_ms = self.max_ms = rtt_ms
+        else:
+            self.min_ms = min(self.min_ms, rtt_ms)
+            self.max_ms = max(self.max_ms, rtt_ms)
+        self.avg_ms += (rtt_ms - self.avg_ms) / self.received
+        if self._last_ms is not None:
+            self.jitter_ms += (abs(rtt_ms - self._last_ms) - self.jitter_ms) / (self.received - 1)
+        self._last_ms = rtt_ms
+
+    @property
+    def loss_percent(self) -> float:
+        if not self.sent:
+            return 100.0
+        return 100.0 * (self.sent - self.received) / self.sent
 
 class PingService:
+    _icmp_mode: Optional[str] = None  # None = 아직 확인 전
+    _sequence = itertools.count(1)
+    _sweep_identifiers = itertools.count(os.getpid() + 1)  # raw 소켓에서 sweep 간 응답 구분용
+
+    @staticmethod
+    def extract_host(ip_address: str) -> str:
+        return extract_host(ip_address)
+
     @staticmethod
     def check_ping(ip_address: str, timeout_ms: int = 1000) -> Tuple[bool, float]:
         """
         Pings an IP address and returns (success: bool, response_time_ms: float)
+        In-process ICMP is used when available, otherwise the system ping command.
         """
-        # URL 형태 (http://, https://) 여부 확인 후 호스트명만 추출
-        if ip_address.startswith("http://") or ip_address.startswith("https://"):
-            parsed_url = urlparse(ip_address)
-            ip_address = parsed_url.hostname or ip_address
-            # 포트 번호가 포함되어있는 경우 제거
-            if ":" in ip_address:
-                ip_address = ip_address.split(":")[0]
-                
+        ip_address = PingService.extract_host(ip_address)
+
+        result = PingService.check_ping_native(ip_address, timeout_ms)
+        if result is not None:
+            return result
+        return PingService._check_ping_subprocess(ip_address, timeout_ms)
+
+    @classmethod
+    def open_icmp_socket(cls) -> Optional[Tuple[socket.socket, bool]]:
+        """
+        Opens an ICMP socket, preferring unprivileged SOCK_DGRAM (Linux only) over SOCK_RAW.
+        Returns (socket, is_raw), or None when neither is permitted.
+        """
+        if cls._icmp_mode == ICMP_MODE_NONE:
+            return None
+
+        candidates = [(ICMP_MODE_RAW, socket.SOCK_RAW)]
+        if platform.system() == "Linux":
+            candidates.insert(0, (ICMP_MODE_DGRAM, socket.SOCK_DGRAM))
+        if cls._icmp_mode is not None:
+            candidates = [c for c in candidates if c[0] == cls._icmp_mode]
+
+        for mode, sock_type in candidates:
+            try:
+                sock = socket.socket(socket.AF_INET, sock_type, socket.IPPROTO_ICMP)
+            except (PermissionError, OSError):
+                continue
+            cls._icmp_mode = mode
+            return sock, mode == ICMP_MODE_RAW
+
+        cls._icmp_mode = ICMP_MODE_NONE
+        return None
+
+    @classmethod
+    def check_ping_native(cls, host: str, timeout_ms: int = 1000) -> Optional[Tuple[bool, float]]:
+        """
+        Sends one ICMP echo from this process and measures the RTT with perf_counter_ns.
+        Returns None when in-process ICMP cannot be used for this host (fallback required).
+        """
+        if ":" in host:
+            return None  # IPv6 는 ping 명령으로 처리
+
+        target = resolver_cache.resolve(host)
+        if target is None:
+            return False, 0.0
+
+        opened = cls.open_icmp_socket()
+        if opened is None:
+            return None
+        sock, is_raw = opened
+
+        identifier = os.getpid() & 0xFFFF
+        sequence = next(cls._sequence) & 0xFFFF
+        unparsed = False  # 대상에서 온 패킷을 해석하지 못함 -> 판정 불가, ping 명령으로 fallback
+        try:
+            with sock:
+                sock.setblocking(False)
+                packet = build_echo_request(identifier, sequence)
+                sent_ns = time.perf_counter_ns()
+                sock.sendto(packet, (target, 0))
+                deadline_ns = sent_ns + timeout_ms * 1_000_000
+
+                while True:
+                    remaining = (deadline_ns - time.perf_counter_ns()) / 1e9
+                    if remaining <= 0:
+                        return None if unparsed else (False, 0.0)
+                    readable, _, _ = select.select([sock], [], [], remaining)
+                    if not readable:
+                        return None if unparsed else (False, 0.0)
+                    data, addr = sock.recvfrom(2048)
+                    received_ns = time.perf_counter_ns()
+
+                    if addr[0] != target:
+                        continue
+                    reply = parse_echo_reply(data)
+                    if reply is None:
+                        unparsed = True
+                        continue
+                    # DGRAM 소켓은 커널이 identifier 를 바꾸고 자기 소켓 응답만 전달함
+                    if reply[1] != sequence or (is_raw and reply[0] != identifier):
+                        continue
+                    return True, (received_ns - sent_ns) / 1_000_000.0
+        except OSError as e:
+            print(f"Ping failed for {host}: {e}")
+            return False, 0.0
+
+    @classmethod
+    def check_ping_many(cls, targets: Iterable[str], timeout_ms: int = 1000) -> Dict[str, Tuple[bool, float]]:
+        """
+        Pings many targets at once over a single ICMP socket.
+        Replies are matched by identifier/sequence and every target gets a result when the
+        shared deadline (last send + timeout) passes. Returns {target: (success, response_time_ms)}.
+        """
+        results: Dict[str, Tuple[bool, float]] = {}
+        by_address: Dict[str, list] = {}  # 해석된 IPv4 주소 -> 해당 주소를 쓰는 target 목록
+        fallback = []
+
+        for target in dict.fromkeys(targets):
+            host = cls.extract_host(target)
+            if ":" in host:
+                fallback.append(target)
+                continue
+            address = resolver_cache.resolve(host)
+            if address is None:
+                results[target] = (False, 0.0)
+                continue
+            by_address.setdefault(address, []).append(target)
+
+        addresses = list(by_address)
+        for start in range(0, len(addresses), SWEEP_CHUNK_SIZE):
+            chunk = addresses[start:start + SWEEP_CHUNK_SIZE]
+            rtts = cls._sweep(chunk, timeout_ms)
+            if rtts is None:
+                # in-process ICMP 를 쓸 수 없으면 개별 ping 으로 처리
+                fallback.extend(t for address in addresses[start:] for t in by_address[address])
+                break
+            for address in chunk:
+                rtt = rtts.get(address)
+                for target in by_address[address]:
+                    results[target] = (True, rtt) if rtt is not None else (False, 0.0)
+
+        if fallback:
+            with ThreadPoolExecutor(max_workers=min(32, len(fallback))) as executor:
+                for target, result in zip(fallback, executor.map(lambda t: cls.check_ping(t, timeout_ms), fallback)):
+                    results[target] = result
+        return results
+
+    @classmethod
+    def _sweep(cls, addresses: list, timeout_ms: int) -> Optional[Dict[str, float]]:
+        """
+        Sends one echo per address on a shared socket. Returns {address: rtt_ms} for replies,
+        None when in-process ICMP is unavailable or no reply could be validated (fallback).
+        """
+        opened = cls.open_icmp_socket()
+        if opened is None:
+            return None
+        sock, is_raw = opened
+
+        identifier = next(cls._sweep_identifiers) & 0xFFFF
+        outstanding = {}   # sequence -> (address, sent_ns)
+        rtts: Dict[str, float] = {}
+        to_send = deque((address, sequence) for sequence, address in enumerate(addresses))
+        timeout_ns = timeout_ms * 1_000_000
+        deadline_ns = time.perf_counter_ns() + timeout_ns
+        unparsed = False
+
+        try:
+            with sock:
+                sock.setblocking(False)
+                try:
+                    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SWEEP_RCVBUF_BYTES)
+                except OSError:
+                    pass
+
+                while to_send or outstanding:
+                    # 1) 송신 버퍼가 허용하는 만큼 전송
+                    while to_send:
+                        address, sequence = to_send[0]
+                        try:
+                            sent_ns = time.perf_counter_ns()
+                            sock.sendto(build_echo_request(identifier, sequence), (address, 0))
+                        except (BlockingIOError, InterruptedError):
+                            break
+                        except OSError as e:
+                            if e.errno == errno.ENOBUFS:
+                                break
+                            to_send.popleft()  # 라우팅 불가 등 -> 실패 처리
+                            continue
+                        to_send.popleft()
+                        outstanding[sequence] = (address, sent_ns)
+                        deadline_ns = sent_ns + timeout_ns
+
+                    remaining = (deadline_ns - time.perf_counter_ns()) / 1e9
+                    if remaining <= 0 and not to_send:
+                        break
+
+                    # 2) 응답 대기 (보낼 것이 남아 있으면 쓰기 가능 여부도 함께 대기)
+                    readable, _, _ = select.select([sock], [sock] if to_send else [], [], max(0.0, remaining))
+
+                    # 3) 수신 버퍼 비우기
+                    while readable:
+                        try:
+                            data, addr = sock.recvfrom(2048)
+                        except (BlockingIOError, InterruptedError):
+                            break
+                        received_ns = time.perf_counter_ns()
+                        reply = parse_echo_reply(data)
+                        if reply is None:
+                            unparsed = True
+                            continue
+                        if is_raw and reply[0] != identifier:
+                            continue
+                        entry = outstanding.get(reply[1])
+                        if entry is None or entry[0] != addr[0]:
+                            continue
+                        del outstanding[reply[1]]
+                        rtts[entry[0]] = (received_ns - entry[1]) / 1_000_000.0
+        except OSError as e:
+            print(f"Ping sweep failed: {e}")
+        if unparsed and not rtts:
+            return None
+        return rtts
+
+    @classmethod
+    def check_ping_burst(cls, ip_address: str, count: int = 3, spacing_ms: int = 200,
+                         timeout_ms: int = 1000) -> PingStats:
+        """
+        Sends `count` echo requests `spacing_ms` apart and returns their PingStats.
+        The burst shares one ICMP socket; without in-process ICMP it falls back to
+        one ping command per sample.
+        """
+        host = cls.extract_host(ip_address)
+        stats = cls._burst_native(host, count, spacing_ms, timeout_ms)
+        if stats is not None:
+            return stats
+
+        stats = PingStats()
+        for index in range(count):
+            if index:
+                time.sleep(spacing_ms / 1000.0)
+            stats.sent += 1
+            success, response_time = cls._check_ping_subprocess(host, timeout_ms)
+            if success:
+                stats.add_reply(response_time)
+        return stats
+
+    @classmethod
+    def _burst_native(cls, host: str, count: int, spacing_ms: int, timeout_ms: int) -> Optional[PingStats]:
+        if ":" in host:
+            return None  # IPv6 는 ping 명령으로 처리
+
+        stats = PingStats()
+        target = resolver_cache.resolve(host)
+        if target is None:
+            stats.sent = count
+            return stats
+
+        opened = cls.open_icmp_socket()
+        if opened is None:
+            return None
+        sock, is_raw = opened
+
+        identifier = next(cls._sweep_identifiers) & 0xFFFF
+        outstanding = {}   # sequence -> sent_ns
+        spacing_ns = spacing_ms * 1_000_000
+        timeout_ns = timeout_ms * 1_000_000
+        next_send_ns = time.perf_counter_ns()
+        deadline_ns = next_send_ns + timeout_ns
+        unparsed = False
+
+        try:
+            with sock:
+                sock.setblocking(False)
+                while stats.sent < count or outstanding:
+                    now_ns = time.perf_counter_ns()
+                    if stats.sent < count and now_ns >= next_send_ns:
+                        sequence = stats.sent
+                        stats.sent += 1
+                        try:
+                            sock.sendto(build_echo_request(identifier, sequence), (target, 0))
+                            outstanding[sequence] = now_ns
+                        except OSError:
+                            pass  # 전송 실패는 손실로 집계
+                        next_send_ns = now_ns + spacing_ns
+                        deadline_ns = now_ns + timeout_ns
+                        continue
+
+                    wake_ns = deadline_ns if stats.sent >= count else min(next_send_ns, deadline_ns)
+                    remaining = (wake_ns - now_ns) / 1e9
+                    if stats.sent >= count and remaining <= 0:
+                        break
+
+                    readable, _, _ = select.select([sock], [], [], max(0.0, remaining))
+                    while readable:
+                        try:
+                            data, addr = sock.recvfrom(2048)
+                        except (BlockingIOError, InterruptedError):
+                            break
+                        received_ns = time.perf_counter_ns()
+                        if addr[0] != target:
+                            continue
+                        reply = parse_echo_reply(data)
+                        if reply is None:
+                            unparsed = True
+                            continue
+                        if is_raw and reply[0] != identifier:
+                            continue
+                        sent_ns = outstanding.pop(reply[1], None)
+                        if sent_ns is not None:
+                            stats.add_reply((received_ns - sent_ns) / 1_000_000.0)
+        except OSError as e:
+            print(f"Ping burst failed for {host}: {e}")
+            stats.sent = count
+        if unparsed and not stats.received:
+            return None  # 응답을 해석하지 못함 -> ping 명령으로 다시 측정
+        return stats
+
+    @staticmethod
+    def _check_ping_subprocess(ip_address: str, timeout_ms: int = 1000) -> Tuple[bool, float]:
         param = '-n' if platform.system().lower() == 'windows' else '-c'
         timeout_param = '-w' if platform.system().lower() == 'windows' else '-W'
         
@@ -1,6 +1,18 @@
+import errno
+import selectors
 import socket
-from typing import Tuple
+import struct
+from typing import Dict, Iterable, Tuple
 import time
+from .dns_cache import extract_host, resolver_cache
+
+try:
+    import resource  # Unix 전용 (fd 한도 확인용)
+except ImportError:
+    resource = None
+
+# SO_LINGER(on, 0): close 시 RST 로 즉시 종료하여 TIME_WAIT 가 쌓이지 않게 함
+_LINGER_RESET = struct.pack("ii", 1, 0)
 
 class PortService:
     @staticmethod
@@ -8,14 +20,19 @@ class PortService:
         """
         Checks if a TCP port is open and returns (success: bool, response_time_ms: float)
         """
-        start_time = time.time()
+        address = resolver_cache.resolve(extract_host(ip_address))
+        if address is None:
+            print(f"Port check failed for {ip_address}:{port} - name does not resolve")
+            return False, 0.0
+
+        start_time = time.perf_counter()
         
         try:
             with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
                 s.settimeout(timeout_sec)
-                result = s.connect_ex((ip_address, port))
+                result = s.connect_ex((address, port))
                 
-                end_time = time.time()
+                end_time = time.perf_counter()
                 response_time_ms = (end_time - start_time) * 1000.0
                 
                 if result == 0:
@@ -25,3 +42,104 @@ class PortService:
         except Exception as e:
             print(f"Port check failed for {ip_address}:{port} - {e}")
             return False, 0.0
+
+    @staticmethod
+    def max_sockets(requested: int) -> int:
+        """Caps the number of concurrently open sockets to what the fd limit leaves free."""
+        if resource is None:
+            return requested
+        try:
+            soft_limit, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+        except (ValueError, OSError):
+            return requested
+        if soft_limit == resource.RLIM_INFINITY:
+            return requested
+        # UI, 로그 파일, ICMP 소켓 등을 위해 여유분을 남김
+        return max(1, min(requested, soft_limit // 2))
+
+    @staticmethod
+    def check_ports_many(targets: Iterable[Tuple[str, int]], timeout_sec: float = 2.0,
+                         max_in_flight: int = 512) -> Dict[Tuple[str, int], Tuple[bool, float]]:
+        """
+        Checks many TCP ports concurrently with non-blocking connects on one selector.
+        At most max_in_flight sockets are open at once; each connect gets its own timeout,
+        timed with a monotonic clock. Returns {(host, port): (success, response_time_ms)}.
+        """
+        results: Dict[Tuple[str, int], Tuple[bool, float]] = {}
+        pending = []
+        addresses = {}
+        for host, port in dict.fromkeys(targets):
+            if host not in addresses:
+                addresses[host] = resolver_cache.resolve(extract_host(host))
+                if addresses[host] is None:
+                    print(f"Port check failed for {host}:{port} - name does not resolve")
+            if addresses[host] is None:
+                results[(host, port)] = (False, 0.0)
+            else:
+                pending.append((host, port))
+        pending.reverse()  # pop() 으로 입력 순서대로 꺼내기 위함
+
+        limit = PortService.max_sockets(max_in_flight)
+        timeout_ns = int(timeout_sec * 1e9)
+        selector = selectors.DefaultSelector()
+        in_flight = {}  # socket -> (key, started_ns)
+
+        def finish(sock: socket.socket, key, success: bool, elapsed_ms: float):
+            selector.unregister(sock)
+            del in_flight[sock]
+            try:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, _LINGER_RESET)
+            except OSError:
+                pass
+            sock.close()
+            results[key] = (True, elapsed_ms) if success else (False, 0.0)
+
+        try:
+            while pending or in_flight:
+                # 1) 빈 슬롯만큼 connect 시작
+                while pending and len(in_flight) < limit:
+                    key = pending.pop()
+                    try:
+                        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                    except OSError as e:
+                        # fd 부족 등: 다음 라운드에서 재시도
+                        if in_flight:
+                            pending.append(key)
+                            break
+                        print(f"Port check failed for {key[0]}:{key[1]} - {e}")
+                        results[key] = (False, 0.0)
+                        continue
+                    sock.setblocking(False)
+                    started_ns = time.perf_counter_ns()
+                    code = sock.connect_ex((addresses[key[0]], key[1]))
+                    in_flight[sock] = (key, started_ns)
+                    selector.register(sock, selectors.EVENT_WRITE)
+                    if code == 0:
+                        finish(sock, key, True, (time.perf_counter_ns() - started_ns) / 1e6)
+                    elif code not in (errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EALREADY):
+                        finish(sock, key, False, 0.0)
+
+                if not in_flight:
+                    continue
+
+                # 2) 가장 먼저 만료되는 connect 기준으로 대기
+                now_ns = time.perf_counter_ns()
+                oldest_ns = min(started for _, started in in_flight.values())
+                wait_sec = max(0.0, (oldest_ns + timeout_ns - now_ns) / 1e9)
+                for selector_key, _ in selector.select(wait_sec):
+                    sock = selector_key.fileobj
+                    key, started_ns = in_flight[sock]
+                    elapsed_ms = (time.perf_counter_ns() - started_ns) / 1e6
+                    error = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                    finish(sock, key, error == 0, elapsed_ms)
+
+                # 3) 시간 초과 처리 (filtered 포트)
+                now_ns = time.perf_counter_ns()
+                for sock, (key, started_ns) in list(in_flight.items()):
+                    if now_ns - started_ns >= timeout_ns:
+                        finish(sock, key, False, 0.0)
+        finally:
+            for sock in list(in_flight):
+                sock.close()
+            selector.close()
+        return results
@@ -24,7 +24,8 @@ class StatusIndicator(QWidget):
             NodeStatus.NORMAL: QColor("#00c73c"),   # Toss style vibrance green
             NodeStatus.WARNING: QColor("#f4ab2e"),  # Toss style vibrance orange/yellow
             NodeStatus.DEAD: QColor("#f04452"),     # Toss style vibrance red
-            NodeStatus.UNKNOWN: QColor("#b0b8c1")   # Toss style gray
+            NodeStatus.UNKNOWN: QColor("#b0b8c1"),  # Toss style gray
+            NodeStatus.UNREACHABLE: QColor("#6b7684")  # 상위 노드 장애 (dark gray)
         }
         
         rect = self.rect()
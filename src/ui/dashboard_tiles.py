@@ -0,0 +1,189 @@
+from typing import Callable, Iterable, Optional
+from PySide6.QtWidgets import QStyledItemDelegate, QStyle
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex, QRectF, QSize
+from PySide6.QtGui import QColor, QFont, QPainter, QPen
+from src.core.models import NodeModel, NodeStatus
+from src.core.node_manager import NodeManager
+import qtawesome as qta
+
+TILE_SIZE = QSize(280, 150)  # 타일 크기 (간격은 QListView.setSpacing)
+
+_STATUS_TEXT_COLOR = {
+    NodeStatus.NORMAL: "#00c73c",
+    NodeStatus.WARNING: "#f4ab2e",
+    NodeStatus.DEAD: "#f04452",
+    NodeStatus.UNREACHABLE: "#6b7684",
+}
+_IDLE_COLOR = "#8b95a1"
+_NODE_ROLE = Qt.UserRole.value
+_icon_cache = {}  # (icon, color) -> QPixmap
+
+def icon_pixmap(icon_name: str, color: str, size: int = 24):
+    """Dashboard icon pixmap, cached (qta.icon 생성 비용이 큼). White is drawn dark on the white tile."""
+    if color == '#ffffff':
+        color = '#333d4b'  # 흰색 배경에 흰색 아이콘 방지
+    key = (icon_name, color, size)
+    pixmap = _icon_cache.get(key)
+    if pixmap is None:
+        try:
+            pixmap = qta.icon(icon_name, color=color).pixmap(size, size)
+        except Exception:
+            pixmap = qta.icon("fa5s.desktop", color="#333d4b").pixmap(size, size)
+        _icon_cache[key] = pixmap
+    return pixmap
+
+def tile_status_lines(node: NodeModel, subtree_stats: Callable = None):
+    """
+    The two status lines of a dashboard card/tile as ((text, color, bold), (text, color, bold)):
+    ping and port for a device, subtree counts and worst RTT for a folder.
+    """
+    stats = subtree_stats(node.id) if subtree_stats and not node.ip_address else None
+    if stats is not None and stats.total:
+        dead = stats.count(NodeStatus.DEAD) + stats.count(NodeStatus.UNREACHABLE)
+        warning = stats.count(NodeStatus.WARNING)
+        text = f"하위 {stats.total}개: 정상 {stats.count(NodeStatus.NORMAL)} / 지연 {warning} / 장애 {dead}"
+        if dead:
+            line = (text, _STATUS_TEXT_COLOR[NodeStatus.DEAD], True)
+        elif warning:
+            line = (text, _STATUS_TEXT_COLOR[NodeStatus.WARNING], True)
+        elif stats.count(NodeStatus.NORMAL):
+            line = (text, _STATUS_TEXT_COLOR[NodeStatus.NORMAL], True)
+        else:
+            line = (text, _IDLE_COLOR, False)
+        worst = f"최대 응답: {stats.worst_ms:.1f}ms" if stats.worst_ms >= 0 else "최대 응답: -"
+        return line, (worst, _IDLE_COLOR, False)
+
+    status = node.ping_status
+    if status == NodeStatus.NORMAL:
+        ping_text = f"Ping: 정상 ({node.ping_response_time_ms:.1f}ms)"
+    elif status == NodeStatus.WARNING:
+        loss_text = f", 손실 {node.ping_loss_percent:.0f}%" if node.ping_loss_percent else ""
+        ping_text = f"Ping: 지연 ({node.ping_response_time_ms:.1f}ms{loss_text})"
+    elif status == NodeStatus.DEAD:
+        ping_text = "Ping: 연결 실패"
+    elif status == NodeStatus.UNREACHABLE:
+        ping_text = "Ping: 상위 노드 장애"
+    else:
+        ping_text = "Ping: 대기중"
+    ping_line = (ping_text, _STATUS_TEXT_COLOR.get(status, _IDLE_COLOR), status in _STATUS_TEXT_COLOR)
+
+    if not (node.port and node.port > 0):
+        return ping_line, ("Port: 미사용", _IDLE_COLOR, False)
+    status = node.port_status
+    if status == NodeStatus.NORMAL:
+        port_text = f"Port: 정상 ({node.port_response_time_ms:.1f}ms)"
+    elif status == NodeStatus.WARNING:
+        port_text = f"Port: 지연 ({node.port_response_time_ms:.1f}ms)"
+    elif status == NodeStatus.DEAD:
+        port_text = "Port: 연결 실패"
+    elif status == NodeStatus.UNREACHABLE:
+        port_text = "Port: 상위 노드 장애"
+    else:
+        port_text = "Port: 대기중"
+    return ping_line, (port_text, _STATUS_TEXT_COLOR.get(status, _IDLE_COLOR), status in _STATUS_TEXT_COLOR)
+
+class DashboardTileModel(QAbstractListModel):
+    """
+    Flat list of the dashboard nodes (NodeManager.dashboard_nodes(), tree order) for the tile view.
+    Rows hold the NodeModel itself (Qt.UserRole); the delegate paints everything from it.
+    """
+    def __init__(self, node_manager: NodeManager, parent=None):
+        super().__init__(parent)
+        self.node_manager = node_manager
+        self._nodes = []
+        self._row_of = {}  # node_id -> row
+        self.reload()
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._nodes)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        role = getattr(role, "value", role)
+        node = self._nodes[index.row()]
+        if role == _NODE_ROLE:
+            return node
+        if role == Qt.DisplayRole.value:
+            return node.name
+        if role == Qt.ToolTipRole.value:
+            return node.ip_address or node.name
+        return None
+
+    def reload(self):
+        """Picks up added/removed/reordered nodes (구성이 같으면 행은 그대로 두고 내용만 갱신)."""
+        nodes = self.node_manager.dashboard_nodes()
+        if [node.id for node in nodes] == [node.id for node in self._nodes]:
+            # import 등으로 객체만 새로 생성된 경우
+            self._nodes = nodes
+            if nodes:
+                self.dataChanged.emit(self.index(0), self.index(len(nodes) - 1))
+            return
+        self.beginResetModel()
+        self._nodes = nodes
+        self._row_of = {node.id: row for row, node in enumerate(nodes)}
+        self.endResetModel()
+
+    def nodes_changed(self, node_ids: Iterable[str]):
+        """dataChanged for the tiles of the given nodes (한 번의 row span 으로)."""
+        rows = [self._row_of[node_id] for node_id in node_ids if node_id in self._row_of]
+        if rows:
+            self.dataChanged.emit(self.index(min(rows)), self.index(max(rows)))
+
+class DashboardTileDelegate(QStyledItemDelegate):
+    """Paints a dashboard tile (DashboardCard 와 같은 모양) directly, without widgets per node."""
+    def __init__(self, subtree_stats: Optional[Callable] = None, parent=None):
+        super().__init__(parent)
+        self.subtree_stats = subtree_stats
+        self._title_font = QFont()
+        self._title_font.setPixelSize(16)
+        self._title_font.setBold(True)
+        self._sub_font = QFont()
+        self._sub_font.setPixelSize(13)
+        self._sub_bold_font = QFont(self._sub_font)
+        self._sub_bold_font.setBold(True)
+        self._border_pen = QPen(QColor("#e5e8eb"), 1)
+        self._hover_pen = QPen(QColor("#3182f6"), 1)
+
+    def sizeHint(self, option, index) -> QSize:
+        return TILE_SIZE
+
+    def paint(self, painter: QPainter, option, index: QModelIndex):
+        node = index.data(_NODE_ROLE)
+        if node is None:
+            return
+        hover = bool(option.state & QStyle.State_MouseOver)
+        rect = QRectF(option.rect).adjusted(0.5, 0.5, -0.5, -0.5)
+        accent = "#3182f6" if hover else node.dashboard_color
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        # 카드 배경 + 테두리, 상단 4px 색상 띠
+        painter.setPen(self._hover_pen if hover else self._border_pen)
+        painter.setBrush(QColor("#f9fafb" if hover else "white"))
+        painter.drawRoundedRect(rect, 16, 16)
+        painter.setClipRect(QRectF(rect.left(), rect.top(), rect.width(), 4))
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor(accent))
+        painter.drawRoundedRect(rect, 16, 16)
+        painter.setClipping(False)
+
+        left = rect.left() + 20
+        width = rect.width() - 40
+        painter.drawPixmap(int(left), int(rect.top() + 20), icon_pixmap(node.dashboard_icon, node.dashboard_color))
+        painter.setFont(self._title_font)
+        painter.setPen(QColor("#191f28"))
+        title_rect = QRectF(left + 32, rect.top() + 18, width - 32, 28)
+        painter.drawText(title_rect, Qt.AlignLeft | Qt.AlignVCenter,
+                         painter.fontMetrics().elidedText(node.name, Qt.ElideRight, int(title_rect.width())))
+
+        lines = [(node.ip_address if node.ip_address else "N/A", _IDLE_COLOR, False)]
+        lines.extend(tile_status_lines(node, self.subtree_stats))
+        top = rect.bottom() - 20 - 20 * len(lines)
+        for text, color, bold in lines:
+            painter.setFont(self._sub_bold_font if bold else self._sub_font)
+            painter.setPen(QColor(color))
+            painter.drawText(QRectF(left, top, width, 20), Qt.AlignLeft | Qt.AlignVCenter,
+                             painter.fontMetrics().elidedText(text, Qt.ElideRight, int(width)))
+            top += 20
+        painter.restore()
@@ -1,15 +1,18 @@
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QLabel, QPushButton, QScrollArea, QFrame
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QLabel, QPushButton, QScrollArea, QFrame, QListView
 from PySide6.QtCore import Qt, QTimer
 from datetime import datetime
 from src.core.node_manager import NodeManager
-from src.core.models import NodeStatus, NodeType
+from src.core.models import NodeType
 from src.ui.styles import TOSS_STYLE_QSS
-import qtawesome as qta
+from src.ui.dashboard_tiles import DashboardTileModel, DashboardTileDelegate, icon_pixmap, tile_status_lines
+
+DASHBOARD_CARD_LIMIT = 200  # 표시 노드가 이보다 많으면 위젯 카드 대신 가상화된 타일 보기 사용
 
 class DashboardCard(QFrame):
-    def __init__(self, node):
+    def __init__(self, node, subtree_stats=None):
         super().__init__()
         self.node = node
+        self.subtree_stats = subtree_stats  # node_id -> SubtreeStats (폴더 카드 집계 표시용)
         self.setObjectName("DashboardCard")
         # Removing WA_TranslucentBackground as it can conflict with QSS border updates on Windows
         self._last_dashboard_color = getattr(self.node, 'dashboard_color', '#ffffff')
@@ -43,13 +46,7 @@ class DashboardCard(QFrame):
         # 상단 (이름 및 상태 등)
         top_layout = QHBoxLayout()
         self.icon_label = QLabel()
-        try:
-            ic_name = getattr(self.node, 'dashboard_icon', 'fa5s.desktop')
-            ic_color = getattr(self.node, 'dashboard_color', '#333d4b')
-            if ic_color == '#ffffff': ic_color = '#333d4b' # 흰색 배경에 흰색 아이콘 방지
-            self.icon_label.setPixmap(qta.icon(ic_name, color=ic_color).pixmap(24, 24))
-        except Exception:
-            self.icon_label.setPixmap(qta.icon("fa5s.desktop", color="#333d4b").pixmap(24, 24))
+        self.icon_label.setPixmap(icon_pixmap(self._current_dashboard_icon, self._last_dashboard_color))
             
         self.title_label = QLabel(node.name)
         self.title_label.setProperty("class", "CardTitle")
@@ -111,58 +108,46 @@ class DashboardCard(QFrame):
             self.style().polish(self)
         
         # Update icon if changed
-        try:
-            ic_color = new_color
-            if ic_color == '#ffffff': ic_color = '#333d4b' # 흰색 배경 방지
-            self.icon_label.setPixmap(qta.icon(new_icon, color=ic_color).pixmap(24, 24))
-        except Exception:
-            self.icon_label.setPixmap(qta.icon("fa5s.desktop", color="#333d4b").pixmap(24, 24))
+        self.icon_label.setPixmap(icon_pixmap(new_icon, new_color))
             
         self.title_label.setText(self.node.name)
         self.ip_label.setText(self.node.ip_address if self.node.ip_address else "N/A")
-        
-        if self.node.ping_status == NodeStatus.NORMAL:
-            self.status_detail.setText(f"Ping: 정상 ({self.node.ping_response_time_ms:.1f}ms)")
-            self.status_detail.setStyleSheet("color: #00c73c; font-weight: bold;")
-        elif self.node.ping_status == NodeStatus.WARNING:
-            self.status_detail.setText(f"Ping: 지연 ({self.node.ping_response_time_ms:.1f}ms)")
-            self.status_detail.setStyleSheet("color: #f4ab2e; font-weight: bold;")
-        elif self.node.ping_status == NodeStatus.DEAD:
-            self.status_detail.setText("Ping: 연결 실패")
-            self.status_detail.setStyleSheet("color: #f04452; font-weight: bold;")
-        else:
-            self.status_detail.setText("Ping: 대기중")
-            self.status_detail.setStyleSheet("color: #8b95a1;")
 
-        if hasattr(self.node, 'port') and self.node.port and self.node.port > 0:
-            if self.node.port_status == NodeStatus.NORMAL:
-                self.port_status_detail.setText(f"Port: 정상 ({self.node.port_response_time_ms:.1f}ms)")
-                self.port_status_detail.setStyleSheet("color: #00c73c; font-weight: bold;")
-            elif self.node.port_status == NodeStatus.WARNING:
-                self.port_status_detail.setText(f"Port: 지연 ({self.node.port_response_time_ms:.1f}ms)")
-                self.port_status_detail.setStyleSheet("color: #f4ab2e; font-weight: bold;")
-            elif self.node.port_status == NodeStatus.DEAD:
-                self.port_status_detail.setText("Port: 연결 실패")
-                self.port_status_detail.setStyleSheet("color: #f04452; font-weight: bold;")
-            else:
-                self.port_status_detail.setText("Port: 대기중")
-                self.port_status_detail.setStyleSheet("color: #8b95a1;")
-        else:
-            self.port_status_detail.setText("Port: 미사용")
-            self.port_status_detail.setStyleSheet("color: #8b95a1;")
+        # 폴더 카드는 자신의 (빈) ping 상태 대신 하위 노드 집계 표시
+        ping_line, port_line = tile_status_lines(self.node, self.subtree_stats)
+        self._set_line(self.status_detail, ping_line)
+        self._set_line(self.port_status_detail, port_line)
+
+    @staticmethod
+    def _set_line(label: QLabel, line):
+        text, color, bold = line
+        label.setText(text)
+        label.setStyleSheet(f"color: {color}; font-weight: bold;" if bold else f"color: {color};")
 
 class DashboardWindow(QWidget):
-    def __init__(self, node_manager: NodeManager):
+    """
+    Dashboard of the nodes marked send_to_dashboard.
+    Two modes: a grid of DashboardCard widgets (3 columns), or for large trees a virtualized tile
+    view (QListView in icon mode + DashboardTileDelegate) that only paints the visible tiles and
+    reflows with the window width. tile_mode=None picks tiles above DASHBOARD_CARD_LIMIT nodes.
+    """
+    def __init__(self, node_manager: NodeManager, tile_mode: bool = None):
         super().__init__()
         self.node_manager = node_manager
+        if tile_mode is None:
+            tile_mode = len(node_manager.dashboard_nodes()) > DASHBOARD_CARD_LIMIT
+        self.tile_mode = tile_mode
         self.setWindowTitle("PingForest - Dashboard")
         self.resize(1000, 700)
         self.setStyleSheet(TOSS_STYLE_QSS)
         
         self.cards = []
+        self._cards_by_id = {}
+        self._structure_version = None  # 카드 구성 시점의 node_manager.structure_version
         
         self.init_ui()
         
+        # 상태 갱신은 update_cards (엔진 결과 batch) 로, 이 타이머는 시계/카드 구성 확인용
         self.refresh_timer = QTimer(self)
         self.refresh_timer.timeout.connect(self.refresh_cards)
         self.refresh_timer.start(1500)
@@ -184,6 +169,23 @@ class DashboardWindow(QWidget):
         
         layout.addLayout(header_layout)
         
+        if self.tile_mode:
+            self.tile_model = DashboardTileModel(self.node_manager, self)
+            self._structure_version = self.node_manager.structure_version
+            self.tile_view = QListView()
+            self.tile_view.setViewMode(QListView.IconMode)
+            self.tile_view.setResizeMode(QListView.Adjust)  # 창 너비에 맞춰 열 수 재배치
+            self.tile_view.setMovement(QListView.Static)
+            self.tile_view.setUniformItemSizes(True)
+            self.tile_view.setSpacing(10)
+            self.tile_view.setSelectionMode(QListView.NoSelection)
+            self.tile_view.setMouseTracking(True)  # hover 테두리
+            self.tile_view.setStyleSheet("QListView { border: none; background-color: transparent; }")
+            self.tile_view.setItemDelegate(DashboardTileDelegate(self.node_manager.subtree_stats, self.tile_view))
+            self.tile_view.setModel(self.tile_model)
+            layout.addWidget(self.tile_view)
+            return
+
         # Scroll Area for Grid
         scroll = QScrollArea()
         scroll.setWidgetResizable(True)
@@ -200,34 +202,59 @@ class DashboardWindow(QWidget):
         self.populate_grid()
         
     def populate_grid(self):
+        if self.tile_mode:
+            self._structure_version = self.node_manager.structure_version
+            self.tile_model.reload()
+            return
+
         # Clear existing
         for i in reversed(range(self.grid_layout.count())): 
             self.grid_layout.itemAt(i).widget().setParent(None)
         self.cards.clear()
+        self._cards_by_id.clear()
+        self._structure_version = self.node_manager.structure_version
             
-        devices = [d for d in self.node_manager.get_all_devices() if getattr(d, 'send_to_dashboard', True)]
+        devices = self.node_manager.dashboard_nodes()
         
         # 3 columns layout
         cols = 3
         for idx, device in enumerate(devices):
             row = idx // cols
             col = idx % cols
-            card = DashboardCard(device)
+            card = DashboardCard(device, self.node_manager.subtree_stats)
             self.grid_layout.addWidget(card, row, col)
             self.cards.append(card)
+            self._cards_by_id[device.id] = card
 
     def refresh_cards(self):
         self.header_title.setText(datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
         
-        devices = [d for d in self.node_manager.get_all_devices() if getattr(d, 'send_to_dashboard', True)]
-        # 카드의 개수나 노드 순서가 바뀌었으면 다시 렌더링
-        if len(devices) != len(self.cards):
+        # 노드 추가/삭제/설정 변경/가져오기가 있었을 때만 카드 구성 확인
+        if self._structure_version == self.node_manager.structure_version:
+            return
+        self._structure_version = self.node_manager.structure_version
+        if self.tile_mode:
+            self.tile_model.reload()
+            return
+        devices = self.node_manager.dashboard_nodes()
+        if [card.node.id for card in self.cards] != [device.id for device in devices]:
+            # 카드의 개수나 노드 순서가 바뀌었으면 다시 렌더링
             self.populate_grid()
-        else:
-            for i, card in enumerate(self.cards):
-                if card.node.id != devices[i].id:
-                    self.populate_grid()
-                    return
+            return
+        for card, device in zip(self.cards, devices):
+            if card.node is not device:
+                # import 등으로 객체가 새로 생성된 경우
+                card.node = device
+            card.update_ui()
+
+    def update_cards(self, changed_ids: set):
+        """Refreshes only the cards whose node changed in the latest result batch."""
+        if self.tile_mode:
+            self.tile_model.nodes_changed(changed_ids)
+            return
+        for node_id in changed_ids:
+            card = self._cards_by_id.get(node_id)
+            if card is not None:
                 card.update_ui()
                 
     def toggle_fullscreen(self):
@@ -1,14 +1,17 @@
 from PySide6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QTreeView, QPushButton, QHeaderView, QFrame, QFormLayout, QLineEdit, QSpinBox, QListWidget, QComboBox, QMenu, QMessageBox, QSplitter, QFileDialog, QCheckBox, QColorDialog, QDialog, QGridLayout, QToolButton
-from PySide6.QtGui import QStandardItemModel, QStandardItem, QIcon, QColor, QBrush, QAction
+from PySide6.QtGui import QIcon, QColor, QAction
 import qtawesome as qta
 from datetime import datetime
-from PySide6.QtCore import Qt, QModelIndex, Signal, Slot, QTimer, QSettings
+from PySide6.QtCore import Qt, QModelIndex, Signal, Slot, QSettings
 
 from src.core.node_manager import NodeManager
 from src.core.monitor_engine import MonitorEngine
 from src.core.models import NodeModel, NodeType, NodeStatus
 from src.ui.styles import TOSS_STYLE_QSS
 from src.ui.components.status_indicator import StatusIndicator
+from src.ui.node_tree_model import NodeTreeModel
+
+EXPAND_ALL_LIMIT = 2000  # 노드 수가 이 이하이면 시작 시 트리를 모두 펼침 (그 이상은 최상위만)
 
 class MainWindow(QMainWindow):
     def __init__(self, node_manager: NodeManager, monitor_engine: MonitorEngine):
@@ -24,19 +27,30 @@ class MainWindow(QMainWindow):
         
         self.init_ui()
         self.populate_tree()
-        self.monitor_engine.log_updated.connect(self.on_log_updated)
-        
-        # 주기적으로 트리뷰 리프레시를 위해 Qt 타이머 사용 (간단한 구현)
-        self.refresh_timer = QTimer(self)
-        self.refresh_timer.timeout.connect(self.update_tree_status_only)
-        self.refresh_timer.start(1000)
+        # 검사 결과는 엔진이 프레임 단위로 묶어서 전달 (결과마다 갱신하지 않음)
+        self.monitor_engine.results_ready.connect(self.on_results_ready)
 
-    def on_log_updated(self, node_id: str, msg: str):
-        if self._current_selected_node_id == node_id:
-            self.log_list.insertItem(0, msg)
-            if self.log_list.count() > 1000:
+    def on_results_ready(self, changed_ids: list, logged_ids: list):
+        # 상위 폴더의 하위 상태 집계도 바뀌므로 조상 행까지 갱신
+        changed = self.node_manager.with_ancestors(changed_ids)
+        self.tree_model.rows_changed(changed, first_column=1)
+
+        selected_id = self._current_selected_node_id
+        if selected_id in changed:
+            node = self.node_manager.get_node(selected_id)
+            if node:
+                self._update_status_panel(node)
+                # 새 이력 항목만 문자열로 변환
+                new_entries = logged_ids.count(selected_id)
+                if new_entries:
+                    for msg in node.history.lines(node.name, node.port, last=new_entries):
+                        self.log_list.insertItem(0, msg)
+            while self.log_list.count() > 1000:
                 self.log_list.takeItem(1000)
 
+        if hasattr(self, 'dashboard_window') and self.dashboard_window.isVisible():
+            self.dashboard_window.update_cards(changed)
+
     def init_ui(self):
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
@@ -57,12 +71,13 @@ class MainWindow(QMainWindow):
         self.tree_view = QTreeView()
         self.tree_view.setHeaderHidden(False)
         self.tree_view.setEditTriggers(QTreeView.NoEditTriggers)
+        self.tree_view.setUniformRowHeights(True)  # 행마다 sizeHint 를 다시 계산하지 않음 (큰 트리 상태 갱신)
         self.tree_view.clicked.connect(self.on_tree_clicked)
         self.tree_view.setContextMenuPolicy(Qt.CustomContextMenu)
         self.tree_view.customContextMenuRequested.connect(self.on_tree_context_menu)
         
-        self.tree_model = QStandardItemModel()
-        self.tree_model.setHorizontalHeaderLabels(["노드명", "IP상태", "Port상태"])
+        # NodeManager 의 노드를 직접 읽는 lazy 모델 (편집은 tree_model.add_node/remove_node/node_changed)
+        self.tree_model = NodeTreeModel(self.node_manager, self)
         self.tree_view.setModel(self.tree_model)
         
         # 헤더 텍스트 중앙 정렬
@@ -122,6 +137,50 @@ class MainWindow(QMainWindow):
         self.input_interval.setRange(1, 3600)
         self.input_interval.setSuffix(" 초")
         
+        # 적응형 주기 (안정적이면 최대 주기까지 점점 늘림)
+        adaptive_layout = QHBoxLayout()
+        self.input_adaptive_interval = QCheckBox("사용")
+        self.input_max_interval = QSpinBox()
+        self.input_max_interval.setRange(1, 86400)
+        self.input_max_interval.setSuffix(" 초")
+        self.input_max_interval.setPrefix("최대 ")
+        adaptive_layout.addWidget(self.input_adaptive_interval)
+        adaptive_layout.addWidget(self.input_max_interval)
+        adaptive_layout.addStretch()
+        
+        # 다중 ping (손실률/지터 기반 상태 판정)
+        burst_layout = QHBoxLayout()
+        self.input_ping_count = QSpinBox()
+        self.input_ping_count.setRange(1, 20)
+        self.input_ping_count.setSuffix(" 회")
+        self.input_ping_spacing = QSpinBox()
+        self.input_ping_spacing.setRange(10, 5000)
+        self.input_ping_spacing.setSuffix(" ms")
+        self.input_ping_spacing.setPrefix("간격 ")
+        burst_layout.addWidget(self.input_ping_count)
+        burst_layout.addWidget(self.input_ping_spacing)
+        burst_layout.addStretch()
+        
+        # 경고/장애 기준
+        threshold_layout = QHBoxLayout()
+        self.input_warning_latency = QSpinBox()
+        self.input_warning_latency.setRange(0, 10000)
+        self.input_warning_latency.setSuffix(" ms")
+        self.input_warning_latency.setPrefix("지연 ")
+        self.input_warning_latency.setSpecialValueText("지연 사용 안함")
+        self.input_warning_loss = QSpinBox()
+        self.input_warning_loss.setRange(1, 100)
+        self.input_warning_loss.setSuffix(" %")
+        self.input_warning_loss.setPrefix("경고 손실 ")
+        self.input_dead_loss = QSpinBox()
+        self.input_dead_loss.setRange(1, 100)
+        self.input_dead_loss.setSuffix(" %")
+        self.input_dead_loss.setPrefix("장애 손실 ")
+        threshold_layout.addWidget(self.input_warning_latency)
+        threshold_layout.addWidget(self.input_warning_loss)
+        threshold_layout.addWidget(self.input_dead_loss)
+        threshold_layout.addStretch()
+        
         # 대시보드 옵션 Layout
         self.input_send_to_dashboard = QCheckBox()
         self.input_send_to_dashboard.setChecked(True)
@@ -188,6 +247,9 @@ class MainWindow(QMainWindow):
         form_layout.addRow("IP/Host:", self.input_ip)
         form_layout.addRow("Port (옵션):", self.input_port)
         form_layout.addRow("체크 주기:", self.input_interval)
+        form_layout.addRow("적응형 주기:", adaptive_layout)
+        form_layout.addRow("Ping 횟수:", burst_layout)
+        form_layout.addRow("상태 기준:", threshold_layout)
         form_layout.addRow("대시보드 노출:", self.input_send_to_dashboard)
         form_layout.addRow("대시보드 색상:", color_layout)
         form_layout.addRow("대시보드 아이콘:", icon_layout)
@@ -216,8 +278,14 @@ class MainWindow(QMainWindow):
         self.btn_export_logs.setFixedWidth(80)
         self.btn_export_logs.clicked.connect(self.on_export_logs)
         
+        # 보관된 일자별 로그 (압축 파일 포함) 에서 선택 노드 기록 전체 내보내기
+        self.btn_export_archived_logs = QPushButton("전체 기간")
+        self.btn_export_archived_logs.setFixedWidth(80)
+        self.btn_export_archived_logs.clicked.connect(self.on_export_archived_logs)
+        
         log_header_layout.addWidget(self.log_title)
         log_header_layout.addStretch()
+        log_header_layout.addWidget(self.btn_export_archived_logs)
         log_header_layout.addWidget(self.btn_export_logs)
         
         self.log_list = QListWidget()
@@ -259,153 +327,44 @@ class MainWindow(QMainWindow):
         super().closeEvent(event)
 
     def populate_tree(self):
-        # Save exact selection context before clearing
-        selected_indexes = self.tree_view.selectedIndexes()
-        
-        self.tree_model.invisibleRootItem().removeRows(0, self.tree_model.rowCount())
-        for node in self.node_manager.root_nodes:
-            self._add_node_to_tree(node, self.tree_model.invisibleRootItem())
-            
-        self.tree_view.expandAll()
+        # 트리 전체 재구성 (시작, 가져오기). 일반 편집은 모델이 행 단위로 반영하므로 호출하지 않음
+        expanded_ids = [node_id for node_id in self.tree_model.fetched_ids()
+                        if self.tree_view.isExpanded(self.tree_model.index_of(node_id))]
+        self.tree_model.reset()
+
+        if expanded_ids:
+            for node_id in expanded_ids:
+                index = self.tree_model.index_of(node_id)
+                if index.isValid():
+                    self.tree_view.expand(index)
+        elif len(self.node_manager._all_nodes) <= EXPAND_ALL_LIMIT:
+            self.tree_view.expandAll()
+        else:
+            self.tree_view.expandToDepth(0)
         
         # Restore Tree Selection 
-        if self._current_selected_node_id:
-            self._restore_selection()
-        elif self.tree_model.rowCount() > 0:
-            # 기본으로 첫 번째 노드 포커싱 주고 상세 정보 로드
-            first_idx = self.tree_model.index(0, 0)
-            if first_idx.isValid():
-                self.tree_view.setCurrentIndex(first_idx)
-                node_id = first_idx.data(Qt.UserRole)
-                if node_id:
-                    self._current_selected_node_id = node_id
-                    self._load_node_details(node_id)
-            
-    def update_tree_status_only(self):
-        # 전체 갱신(populate_tree)으로 인한 UI 깜빡임을 방지, 상태만 갱신
-        self._update_node_status_recursive(self.tree_model.invisibleRootItem())
-
-    def _update_node_status_recursive(self, parent_item: QStandardItem):
-        for row in range(parent_item.rowCount()):
-            name_item = parent_item.child(row, 0)
-            ping_item = parent_item.child(row, 1)
-            port_item = parent_item.child(row, 2)
-            
-            node_id = name_item.data(Qt.UserRole)
-            if node_id:
-                node = self.node_manager.get_node(node_id)
-                if node and getattr(node, 'type', None) == NodeType.DEVICE:
-                    emoji_map = {
-                        NodeStatus.NORMAL: "🟢",
-                        NodeStatus.WARNING: "🟡",
-                        NodeStatus.DEAD: "🔴",
-                        NodeStatus.UNKNOWN: "⚪"
-                    }
-                    color_map = {
-                        NodeStatus.NORMAL: QColor("#00c73c"),
-                        NodeStatus.WARNING: QColor("#f4ab2e"),
-                        NodeStatus.DEAD: QColor("#f04452"),
-                        NodeStatus.UNKNOWN: QColor("#b0b8c1")
-                    }
-                    
-                    if not node.ip_address:
-                        ping_item.setText("📁")
-                        port_item.setText("📁")
-                        ping_item.setForeground(QBrush(QColor("#b0b8c1")))
-                        port_item.setForeground(QBrush(QColor("#b0b8c1")))
-                    else:
-                        ping_item.setText(emoji_map.get(node.ping_status, "⚪"))
-                        ping_item.setForeground(QBrush(color_map.get(node.ping_status, QColor("#b0b8c1"))))
-                        
-                        if getattr(node, 'port', None) and node.port > 0:
-                            port_item.setText(emoji_map.get(getattr(node, 'port_status', NodeStatus.UNKNOWN), "⚪"))
-                            port_item.setForeground(QBrush(color_map.get(getattr(node, 'port_status', NodeStatus.UNKNOWN), QColor("#b0b8c1"))))
-                        else:
-                            port_item.setText("➖")
-                            port_item.setForeground(QBrush(QColor("#b0b8c1")))
+        if not (self._current_selected_node_id and self._select_node(self._current_selected_node_id)):
+            self._select_first_node()
 
-            # 자식 노드 재귀 갱신
-            self._update_node_status_recursive(name_item)
-            
-    def _restore_selection(self):
-        match_list = self.tree_model.match(
-            self.tree_model.index(0, 0),
-            Qt.UserRole,
-            self._current_selected_node_id,
-            1,
-            Qt.MatchExactly | Qt.MatchRecursive
-        )
-        if match_list:
-            self.tree_view.setCurrentIndex(match_list[0])
+    def _select_node(self, node_id: str) -> bool:
+        index = self.tree_model.index_of(node_id)
+        if index.isValid():
+            self.tree_view.setCurrentIndex(index)
+        return index.isValid()
 
-    def _add_node_to_tree(self, node: NodeModel, parent_item: QStandardItem):
-        # Name Item
-        name_item = QStandardItem(node.name)
-        name_item.setData(node.id, Qt.UserRole)
-        
-        # Status Items 
-        ping_status_text = "N/A"
-        port_status_text = "N/A"
-        overall_ping_status = NodeStatus.UNKNOWN
-        overall_port_status = NodeStatus.UNKNOWN
-        
-        emoji_map = {
-            NodeStatus.NORMAL: "🟢",
-            NodeStatus.WARNING: "🟡",
-            NodeStatus.DEAD: "🔴",
-            NodeStatus.UNKNOWN: "⚪"
-        }
-        
-        if node.type == NodeType.DEVICE:
-            ping_emoji = emoji_map.get(node.ping_status, "⚪")
-            port_emoji = emoji_map.get(node.port_status, "⚪") if node.port and node.port > 0 else "➖"
-            
-            # IP가 없으면 단순 폴더 역할이므로 상태 표시 X
-            if not node.ip_address:
-                ping_emoji = "📁"
-                port_emoji = "📁"
-            
-            overall_ping_status = node.ping_status
-            overall_port_status = node.port_status
-            
-            ping_status_text = ping_emoji
-            port_status_text = port_emoji
-                
-        ping_item = QStandardItem(ping_status_text)
-        ping_item.setTextAlignment(Qt.AlignCenter)
-        
-        port_item = QStandardItem(port_status_text)
-        port_item.setTextAlignment(Qt.AlignCenter)
-        
-        color_map = {
-            NodeStatus.NORMAL: QColor("#00c73c"),
-            NodeStatus.WARNING: QColor("#f4ab2e"),
-            NodeStatus.DEAD: QColor("#f04452"),
-            NodeStatus.UNKNOWN: QColor("#b0b8c1")
-        }
-        
-        if node.type == NodeType.DEVICE:
-            ping_item.setForeground(QBrush(color_map.get(overall_ping_status, QColor("#b0b8c1"))))
-            if node.port and node.port > 0:
-                port_item.setForeground(QBrush(color_map.get(overall_port_status, QColor("#b0b8c1"))))
-            else:
-                port_item.setForeground(QBrush(QColor("#b0b8c1")))
-            
-        parent_item.appendRow([name_item, ping_item, port_item])
-        
-        for child in node.children:
-            self._add_node_to_tree(child, name_item)
+    def _select_first_node(self):
+        # 기본으로 첫 번째 노드 포커싱 주고 상세 정보 로드
+        first_idx = self.tree_model.index(0, 0)
+        if first_idx.isValid():
+            self.tree_view.setCurrentIndex(first_idx)
+            node_id = first_idx.data(Qt.UserRole)
+            if node_id:
+                self._current_selected_node_id = node_id
+                self._load_node_details(node_id)
 
     def on_tree_clicked(self, index: QModelIndex):
-        item = self.tree_model.itemFromIndex(index)
-        if not item: return
-        node_id = item.data(Qt.UserRole)
-        # 만약 상태 열(1열)을 클릭한 경우 Name 열(0열)의 데이터를 가져와야 함
-        if not node_id:
-            sibling = index.siblingAtColumn(0)
-            item = self.tree_model.itemFromIndex(sibling)
-            node_id = item.data(Qt.UserRole) if item else None
-            
+        # 모든 열의 UserRole 이 노드 id
+        node_id = index.data(Qt.UserRole)
         if node_id:
             self._current_selected_node_id = node_id
             self._load_node_details(node_id)
@@ -418,6 +377,13 @@ class MainWindow(QMainWindow):
         self.input_ip.setText(node.ip_address)
         self.input_port.setValue(node.port if node.port else 0)
         self.input_interval.setValue(node.check_interval_seconds)
+        self.input_adaptive_interval.setChecked(node.adaptive_interval)
+        self.input_max_interval.setValue(node.max_check_interval_seconds)
+        self.input_ping_count.setValue(node.ping_count)
+        self.input_ping_spacing.setValue(node.ping_spacing_ms)
+        self.input_warning_latency.setValue(node.warning_latency_ms)
+        self.input_warning_loss.setValue(node.warning_loss_percent)
+        self.input_dead_loss.setValue(node.dead_loss_percent)
         
         self.input_send_to_dashboard.setChecked(getattr(node, 'send_to_dashboard', True))
         
@@ -433,6 +399,14 @@ class MainWindow(QMainWindow):
         except Exception:
             self.icon_preview.setPixmap(qta.icon("fa5s.desktop", color="#333d4b").pixmap(24, 24))
         
+        self._update_status_panel(node)
+        
+        # 로그 패널 갱신
+        self.log_list.clear()
+        for msg in reversed(node.history.lines(node.name, node.port)):
+            self.log_list.addItem(msg)
+
+    def _update_status_panel(self, node: NodeModel):
         # 상태 텍스트 
         if not node.ip_address:
             self.ping_status_text.setText("폴더(검사 안함)")
@@ -441,12 +415,18 @@ class MainWindow(QMainWindow):
             self.port_status_ind.set_status(NodeStatus.UNKNOWN)
         else:
             self.ping_status_ind.set_status(node.ping_status)
+            # 다중 ping 이면 손실률/지터도 표시
+            burst_text = ""
+            if node.ping_count > 1:
+                burst_text = f", 손실 {node.ping_loss_percent:.0f}%, 지터 {node.ping_jitter_ms:.1f}ms"
             if node.ping_status == NodeStatus.NORMAL:
-                self.ping_status_text.setText(f"Ping: 정상 ({node.ping_response_time_ms:.1f}ms)")
+                self.ping_status_text.setText(f"Ping: 정상 ({node.ping_response_time_ms:.1f}ms{burst_text})")
             elif node.ping_status == NodeStatus.WARNING:
-                self.ping_status_text.setText(f"Ping: 지연 ({node.ping_response_time_ms:.1f}ms)")
+                self.ping_status_text.setText(f"Ping: 지연 ({node.ping_response_time_ms:.1f}ms{burst_text})")
             elif node.ping_status == NodeStatus.DEAD:
                 self.ping_status_text.setText(f"Ping: 연결 실패")
+            elif node.ping_status == NodeStatus.UNREACHABLE:
+                self.ping_status_text.setText("Ping: 상위 노드 장애 (도달 불가)")
             else:
                 self.ping_status_text.setText("Ping: 검사 대기중")
                 
@@ -458,16 +438,13 @@ class MainWindow(QMainWindow):
                     self.port_status_text.setText(f"Port: 지연 ({node.port_response_time_ms:.1f}ms)")
                 elif node.port_status == NodeStatus.DEAD:
                     self.port_status_text.setText(f"Port: 연결 실패")
+                elif node.port_status == NodeStatus.UNREACHABLE:
+                    self.port_status_text.setText("Port: 상위 노드 장애 (도달 불가)")
                 else:
                     self.port_status_text.setText("Port: 대기중")
             else:
                 self.port_status_ind.set_status(NodeStatus.UNKNOWN)
                 self.port_status_text.setText("Port: 미사용")
-        
-        # 로그 패널 갱신
-        self.log_list.clear()
-        for msg in reversed(node.logs):
-            self.log_list.addItem(msg)
 
     def on_save_clicked(self):
         if not self._current_selected_node_id: return
@@ -478,6 +455,13 @@ class MainWindow(QMainWindow):
         node.ip_address = self.input_ip.text()
         node.port = self.input_port.value() if self.input_port.value() > 0 else None
         node.check_interval_seconds = self.input_interval.value()
+        node.adaptive_interval = self.input_adaptive_interval.isChecked()
+        node.max_check_interval_seconds = max(self.input_interval.value(), self.input_max_interval.value())
+        node.ping_count = self.input_ping_count.value()
+        node.ping_spacing_ms = self.input_ping_spacing.value()
+        node.warning_latency_ms = self.input_warning_latency.value()
+        node.warning_loss_percent = self.input_warning_loss.value()
+        node.dead_loss_percent = max(self.input_warning_loss.value(), self.input_dead_loss.value())
         
         node.send_to_dashboard = self.input_send_to_dashboard.isChecked()
         node.dashboard_color = self.input_dashboard_color.text() or "#ffffff"
@@ -485,13 +469,10 @@ class MainWindow(QMainWindow):
         
         self.monitor_engine.update_node_worker(node)
             
-        self.node_manager.save_data()
-        self.populate_tree()
+        self.tree_model.node_changed(node)
         
         if hasattr(self, 'dashboard_window') and self.dashboard_window.isVisible():
-            for card in self.dashboard_window.cards:
-                if card.node.id == node.id:
-                    card.update_ui()
+            self.dashboard_window.update_cards({node.id})
                     
         self.log_list.insertItem(0, "설정이 저장되었습니다.")
 
@@ -504,26 +485,23 @@ class MainWindow(QMainWindow):
         
         new_node = NodeModel("새 장치", NodeType.DEVICE)
             
-        self.node_manager.add_node(new_node, parent_id)
+        self.tree_model.add_node(new_node, parent_id)
         self.monitor_engine.update_node_worker(new_node)
-        self.populate_tree()
+        if parent_id:
+            self.tree_view.expand(self.tree_model.index_of(parent_id))
 
     def on_import_tree(self):
         file_path, _ = QFileDialog.getOpenFileName(self, "트리 가져오기", "", "JSON 파일 (*.json);;모든 파일 (*)")
         if file_path:
-            # 먼저 모니터링 엔진 정지
-            self.monitor_engine.stop_monitoring()
-            
             success = self.node_manager.import_data(file_path)
             if success:
+                # 엔진을 재시작하지 않고 바뀐 노드만 재스케줄
+                self.monitor_engine.apply_config_diff(self.node_manager.last_import_diff)
                 self._current_selected_node_id = None
                 self.populate_tree()
-                # 새 트리에 맞게 모니터링 재개
-                self.monitor_engine.start_monitoring()
                 self.log_list.insertItem(0, f"'{file_path}'에서 트리를 성공적으로 가져왔습니다.")
             else:
                 QMessageBox.warning(self, "가져오기 실패", "트리 데이터를 가져오는 데 실패했습니다.")
-                self.monitor_engine.start_monitoring() # 실패해도 다시 재개
                 
     def on_export_tree(self):
         file_path, _ = QFileDialog.getSaveFileName(self, "트리 내보내기", "pingforest_export.json", "JSON 파일 (*.json);;모든 파일 (*)")
@@ -550,12 +528,37 @@ class MainWindow(QMainWindow):
         if file_path:
             try:
                 with open(file_path, 'w', encoding='utf-8') as f:
-                    for line in node.logs:
+                    for line in node.history.lines(node.name, node.port):
                         f.write(line + "\n")
                 QMessageBox.information(self, "내보내기 완료", f"로그 내보내기를 완료했습니다.\n{file_path}")
             except Exception as e:
                 QMessageBox.warning(self, "내보내기 실패", f"로그 저장 중 오류가 발생했습니다: {e}")
 
+    def on_export_archived_logs(self):
+        if not self._current_selected_node_id:
+            QMessageBox.warning(self, "내보내기 실패", "선택된 노드가 없습니다.")
+            return
+            
+        node = self.node_manager.get_node(self._current_selected_node_id)
+        if not node:
+            return
+            
+        default_file_name = f"{node.name}_전체기간.txt"
+        file_path, _ = QFileDialog.getSaveFileName(self, "전체 기간 로그 내보내기", default_file_name, "텍스트 파일 (*.txt);;모든 파일 (*)")
+        
+        if file_path:
+            from src.core.logger import global_logger
+            try:
+                global_logger.flush(timeout=5)
+                count = 0
+                with open(file_path, 'w', encoding='utf-8') as f:
+                    for line in global_logger.archive.search(node.name):
+                        f.write(line + "\n")
+                        count += 1
+                QMessageBox.information(self, "내보내기 완료", f"{count}줄의 로그를 내보냈습니다.\n{file_path}")
+            except Exception as e:
+                QMessageBox.warning(self, "내보내기 실패", f"로그 저장 중 오류가 발생했습니다: {e}")
+
     def on_show_dashboard(self):
         from src.ui.dashboard_window import DashboardWindow
         if not hasattr(self, 'dashboard_window') or not self.dashboard_window.isVisible():
@@ -628,18 +631,8 @@ class MainWindow(QMainWindow):
             menu.exec(self.tree_view.viewport().mapToGlobal(position))
             return
             
-        item = self.tree_model.itemFromIndex(index)
-        if not item: return
-        node_id = item.data(Qt.UserRole)
-        # 만약 상태 열(1열)을 클릭한 경우 Name 열(0열)의 데이터를 가져와야 함
-        if not node_id:
-            sibling = index.siblingAtColumn(0)
-            item = self.tree_model.itemFromIndex(sibling)
-            node_id = item.data(Qt.UserRole) if item else None
-            if sibling.isValid():
-                self.tree_view.setCurrentIndex(sibling)
-        else:
-            self.tree_view.setCurrentIndex(index)
+        node_id = index.data(Qt.UserRole)
+        self.tree_view.setCurrentIndex(index.siblingAtColumn(0))
             
         if node_id:
             self._current_selected_node_id = node_id
@@ -670,7 +663,16 @@ class MainWindow(QMainWindow):
                                      QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
         
         if reply == QMessageBox.Yes:
-            self.node_manager.remove_node(node.id)
-            if self._current_selected_node_id == node.id:
+            removed_ids = []
+            stack = [node]
+            while stack:
+                current = stack.pop()
+                removed_ids.append(current.id)
+                stack.extend(current.children)
+
+            self.tree_model.remove_node(node.id)
+            for removed_id in removed_ids:
+                self.monitor_engine.remove_node_worker(removed_id)
+            if self._current_selected_node_id in removed_ids:
                 self._current_selected_node_id = None
-            self.populate_tree()
+                self._select_first_node()
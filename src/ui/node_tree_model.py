@@ -0,0 +1,286 @@
+from typing import Iterable, Optional
+from PySide6.QtCore import Qt, QAbstractItemModel, QModelIndex
+from PySide6.QtGui import QBrush, QColor
+from src.core.models import NodeModel, NodeStatus
+from src.core.node_manager import NodeManager
+
+FETCH_BATCH = 1000  # 펼칠 때 한 번에 모델에 노출하는 자식 수
+
+STATUS_EMOJI = {
+    NodeStatus.NORMAL: "🟢",
+    NodeStatus.WARNING: "🟡",
+    NodeStatus.DEAD: "🔴",
+    NodeStatus.UNKNOWN: "⚪",
+    NodeStatus.UNREACHABLE: "⚫"
+}
+STATUS_COLOR = {
+    NodeStatus.NORMAL: "#00c73c",
+    NodeStatus.WARNING: "#f4ab2e",
+    NodeStatus.DEAD: "#f04452",
+    NodeStatus.UNKNOWN: "#b0b8c1",
+    NodeStatus.UNREACHABLE: "#6b7684"
+}
+_STATUS_BRUSHES = {}
+
+# data() 는 화면 갱신마다 수없이 호출됨: Qt enum 비교가 느리므로 role 은 int 로 비교
+_DISPLAY_ROLE = Qt.DisplayRole.value
+_FOREGROUND_ROLE = Qt.ForegroundRole.value
+_TOOLTIP_ROLE = Qt.ToolTipRole.value
+_ALIGNMENT_ROLE = Qt.TextAlignmentRole.value
+_USER_ROLE = Qt.UserRole.value
+_ALIGN_CENTER = Qt.AlignCenter.value
+
+def status_brush(status: NodeStatus) -> QBrush:
+    """Shared QBrush per status (행마다 새로 만들지 않음)."""
+    brush = _STATUS_BRUSHES.get(status)
+    if brush is None:
+        brush = _STATUS_BRUSHES[status] = QBrush(QColor(STATUS_COLOR.get(status, "#b0b8c1")))
+    return brush
+
+class NodeTreeModel(QAbstractItemModel):
+    """
+    Tree model that reads NodeModel objects straight from the NodeManager (no per-row item copies).
+    Children are exposed lazily: a branch only gets rows once the view asks for them (canFetchMore /
+    fetchMore, FETCH_BATCH at a time), so a collapsed folder with thousands of nodes costs nothing.
+    Tree edits go through add_node / remove_node / node_changed, which change the manager and emit
+    the matching rowsInserted / rowsRemoved / dataChanged, so the view keeps selection and expansion.
+    Columns: name, ping status, port status. Qt.UserRole is the node id in every column.
+    """
+    COLUMNS = ("노드명", "IP상태", "Port상태")
+
+    def __init__(self, node_manager: NodeManager, parent=None):
+        super().__init__(parent)
+        self.node_manager = node_manager
+        self._loaded = {}  # parent id (최상위는 None) -> 모델에 노출된 자식 수
+        self._rows = {}    # node_id -> 마지막으로 알려진 행 번호 (형제 목록이 바뀌면 다시 찾음)
+
+    # --- 조회 ---
+
+    def node(self, index: QModelIndex) -> Optional[NodeModel]:
+        return index.internalPointer() if index.isValid() else None
+
+    def _children(self, node: Optional[NodeModel]) -> list:
+        return node.children if node is not None else self.node_manager.root_nodes
+
+    def _row(self, node: NodeModel) -> int:
+        siblings = self._children(self.node_manager.get_node(node.parent_id) if node.parent_id else None)
+        row = self._rows.get(node.id)
+        if row is None or row >= len(siblings) or siblings[row] is not node:
+            row = self._rows[node.id] = siblings.index(node)
+        return row
+
+    def _is_loaded(self, node: NodeModel) -> bool:
+        """True if the node currently has a row in the model (부모가 로드된 경우에만 가능 → 조상도 모두 로드됨)."""
+        return self._row(node) < self._loaded.get(node.parent_id, 0)
+
+    def _parent_index(self, parent_node: Optional[NodeModel]) -> QModelIndex:
+        return self.createIndex(self._row(parent_node), 0, parent_node) if parent_node is not None else QModelIndex()
+
+    def fetched_ids(self) -> list:
+        """Ids of the nodes whose children are in the model (펼침 상태 보존용)."""
+        return [node_id for node_id in self._loaded if node_id is not None]
+
+    def index_of(self, node_id: str, column: int = 0) -> QModelIndex:
+        """Index of a node, fetching its ancestors' children as needed (invalid if not in the tree)."""
+        node = self.node_manager.get_node(node_id)
+        if node is None:
+            return QModelIndex()
+        path = []
+        current = node
+        while current is not None:
+            path.append(current)
+            current = self.node_manager.get_node(current.parent_id) if current.parent_id else None
+        for current in reversed(path):
+            row = self._row(current)
+            while self._loaded.get(current.parent_id, 0) <= row:
+                self._fetch(current.parent_id)
+        return self.createIndex(self._row(node), column, node)
+
+    # --- QAbstractItemModel ---
+
+    def index(self, row: int, column: int, parent: QModelIndex = QModelIndex()) -> QModelIndex:
+        if column < 0 or column >= len(self.COLUMNS) or row < 0:
+            return QModelIndex()
+        parent_node = self.node(parent)
+        if row >= self._loaded.get(parent_node.id if parent_node else None, 0):
+            return QModelIndex()
+        node = self._children(parent_node)[row]
+        self._rows[node.id] = row
+        return self.createIndex(row, column, node)
+
+    def parent(self, index: QModelIndex) -> QModelIndex:
+        node = self.node(index)
+        if node is None or not node.parent_id:
+            return QModelIndex()
+        parent_node = self.node_manager.get_node(node.parent_id)
+        if parent_node is None:
+            return QModelIndex()
+        return self.createIndex(self._row(parent_node), 0, parent_node)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.column() > 0:
+            return 0
+        parent_node = self.node(parent)
+        return self._loaded.get(parent_node.id if parent_node else None, 0)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return len(self.COLUMNS)
+
+    def hasChildren(self, parent: QModelIndex = QModelIndex()) -> bool:
+        if parent.column() > 0:
+            return False
+        return bool(self._children(self.node(parent)))
+
+    def canFetchMore(self, parent: QModelIndex) -> bool:
+        if parent.column() > 0:
+            return False
+        parent_node = self.node(parent)
+        return self._loaded.get(parent_node.id if parent_node else None, 0) < len(self._children(parent_node))
+
+    def fetchMore(self, parent: QModelIndex):
+        parent_node = self.node(parent)
+        self._fetch(parent_node.id if parent_node else None)
+
+    def _fetch(self, parent_id: Optional[str]):
+        parent_node = self.node_manager.get_node(parent_id) if parent_id else None
+        loaded = self._loaded.get(parent_id, 0)
+        count = min(FETCH_BATCH, len(self._children(parent_node)) - loaded)
+        if count <= 0:
+            return
+        self.beginInsertRows(self._parent_index(parent_node), loaded, loaded + count - 1)
+        self._loaded[parent_id] = loaded + count
+        self.endInsertRows()
+
+    def headerData(self, section: int, orientation, role: int = Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole and 0 <= section < len(self.COLUMNS):
+            return self.COLUMNS[section]
+        return None
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        node = index.internalPointer() if index.isValid() else None
+        if node is None:
+            return None
+        role = getattr(role, "value", role)
+        column = index.column()
+        if role == _USER_ROLE:
+            return node.id
+        if column == 0:
+            return node.name if role == _DISPLAY_ROLE else None
+        if role == _ALIGNMENT_ROLE:
+            return _ALIGN_CENTER
+        if role != _DISPLAY_ROLE and role != _FOREGROUND_ROLE and role != _TOOLTIP_ROLE:
+            return None
+        text, status, tooltip = self._status_cell(node, column)
+        if role == _DISPLAY_ROLE:
+            return text
+        if role == _FOREGROUND_ROLE:
+            return status_brush(status)
+        return tooltip
+
+    def _status_cell(self, node: NodeModel, column: int):
+        """(text, colour status, tooltip) of the ping (1) or port (2) column."""
+        if not node.ip_address:
+            return self._folder_cell(node, column)
+        if column == 1:
+            return STATUS_EMOJI.get(node.ping_status, "⚪"), node.ping_status, None
+        if node.port and node.port > 0:
+            return STATUS_EMOJI.get(node.port_status, "⚪"), node.port_status, None
+        return "➖", NodeStatus.UNKNOWN, None
+
+    def _folder_cell(self, node: NodeModel, column: int):
+        """Folder row: worst status of the subtree and the number of problem nodes (툴팁에 상세 집계)."""
+        stats = self.node_manager.subtree_stats(node.id)
+        worst = stats.worst_status() if stats else None
+        if column == 2 or worst is None:
+            return "📁", NodeStatus.UNKNOWN, None
+        text = f"📁{STATUS_EMOJI[worst]} {stats.problems}" if stats.problems else f"📁{STATUS_EMOJI[worst]}"
+        tooltip = (f"하위 노드 {stats.total}개: 정상 {stats.count(NodeStatus.NORMAL)}, "
+                   f"지연 {stats.count(NodeStatus.WARNING)}, 실패 {stats.count(NodeStatus.DEAD)}, "
+                   f"도달 불가 {stats.count(NodeStatus.UNREACHABLE)}, 대기 {stats.count(NodeStatus.UNKNOWN)}")
+        if stats.worst_ms >= 0:
+            tooltip += f"\n최대 응답 시간 {stats.worst_ms:.1f}ms"
+        return text, worst, tooltip
+
+    # --- 변경 (NodeManager 변경 + 세분화된 signal) ---
+
+    def reset(self):
+        """Reloads everything (트리 전체가 바뀐 경우, 예: 가져오기). Only the top level is exposed."""
+        self.beginResetModel()
+        self._loaded = {}
+        self._rows = {}
+        self._loaded[None] = min(FETCH_BATCH, len(self.node_manager.root_nodes))
+        self.endResetModel()
+
+    def add_node(self, node: NodeModel, parent_id: Optional[str] = None):
+        """NodeManager.add_node plus rowsInserted when the parent's children are already in the model."""
+        parent_node = self.node_manager.get_node(parent_id) if parent_id else None
+        row = len(self._children(parent_node))
+        if self._loaded.get(parent_id) == row:
+            self.beginInsertRows(self._parent_index(parent_node), row, row)
+            self.node_manager.add_node(node, parent_id)
+            self._loaded[parent_id] = row + 1
+            self._rows[node.id] = row
+            self.endInsertRows()
+        else:
+            # 아직 펼쳐지지 않은 가지: canFetchMore 로 나중에 노출, 부모 행 (펼침 표시/집계) 만 갱신
+            self.node_manager.add_node(node, parent_id)
+            if parent_node is not None and self._is_loaded(parent_node):
+                self._emit_row_changed(parent_node)
+
+    def remove_node(self, node_id: str):
+        """NodeManager.remove_node plus rowsRemoved for the subtree's row (if it was in the model)."""
+        node = self.node_manager.get_node(node_id)
+        if node is None:
+            return
+        parent_node = self.node_manager.get_node(node.parent_id) if node.parent_id else None
+        removed = [node]
+        for current in removed:
+            removed.extend(current.children)
+        if self._is_loaded(node):
+            row = self._row(node)
+            self.beginRemoveRows(self._parent_index(parent_node), row, row)
+            self.node_manager.remove_node(node_id)
+            self._loaded[node.parent_id] -= 1
+            self._forget(removed)
+            self.endRemoveRows()
+        else:
+            self.node_manager.remove_node(node_id)
+            self._forget(removed)
+
+    def _forget(self, nodes: Iterable[NodeModel]):
+        for node in nodes:
+            self._loaded.pop(node.id, None)
+            self._rows.pop(node.id, None)
+
+    def node_changed(self, node: NodeModel):
+        """NodeManager.node_changed plus dataChanged for the node's row."""
+        self.node_manager.node_changed(node)
+        self.rows_changed(self.node_manager.with_ancestors([node.id]))
+
+    def rows_changed(self, node_ids: Iterable[str], first_column: int = 0):
+        """
+        Emits dataChanged for the given nodes' rows that are in the model (상태 갱신은 first_column=1).
+        Rows are grouped per parent into one row span each, so a large batch costs few signals.
+        """
+        spans = {}  # parent id -> [first row, last row, 그 부모의 자식 노드 하나]
+        for node_id in node_ids:
+            node = self.node_manager.get_node(node_id)
+            if node is None or not self._is_loaded(node):
+                continue
+            row = self._row(node)
+            span = spans.get(node.parent_id)
+            if span is None:
+                spans[node.parent_id] = [row, row, node]
+            else:
+                span[0] = min(span[0], row)
+                span[1] = max(span[1], row)
+        for first, last, node in spans.values():
+            parent_node = self.node_manager.get_node(node.parent_id) if node.parent_id else None
+            siblings = self._children(parent_node)
+            self.dataChanged.emit(self.createIndex(first, first_column, siblings[first]),
+                                  self.createIndex(last, len(self.COLUMNS) - 1, siblings[last]))
+
+    def _emit_row_changed(self, node: NodeModel, first_column: int = 0):
+        row = self._row(node)
+        self.dataChanged.emit(self.createIndex(row, first_column, node),
+                              self.createIndex(row, len(self.COLUMNS) - 1, node))